@@ -2,7 +2,10 @@ from .liabilities import (
     AnnuityCertain,
     DeferredAnnuityCertain,
     GompertzMakeham,
+    JointLifeAnnuity,
+    LastSurvivorAnnuity,
     LifeAnnuityImmediate,
+    ReversionaryAnnuity,
     discount_factor,
 )
 from .risk_helpers import dv01, effective_duration
@@ -11,6 +14,9 @@ __all__ = [
     "AnnuityCertain",
     "DeferredAnnuityCertain",
     "LifeAnnuityImmediate",
+    "JointLifeAnnuity",
+    "LastSurvivorAnnuity",
+    "ReversionaryAnnuity",
     "GompertzMakeham",
     "discount_factor",
     "effective_duration",
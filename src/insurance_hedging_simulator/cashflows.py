@@ -0,0 +1,202 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .curve import ZeroCurve
+from .hedge_swap import SizedSwap, build_schedule, forward_rates
+
+# Cashflow times are rounded to this many decimal places (of a year) before netting, so
+# dates that agree to that precision fall on the same grid date.
+GRID_DECIMALS = 9
+
+
+def swap_cashflows(
+    swap: SizedSwap, projection_curve: Optional[ZeroCurve] = None
+) -> List[Tuple[float, float]]:
+    """
+    Cashflow-equivalent legs of a spot-start swap.
+    Float leg: +notional at t=0 and -notional at T (replicates notional * (1 - DF(T)));
+    with a projection curve, the projected coupons notional * accrual * F_i instead.
+    Fixed leg: -notional * K * accrual at each pay date. Signs are for payer-fixed and
+    flipped for receiver-fixed, so sum(cf * DF(t)) equals `SizedSwap.pv`.
+    """
+    pay_times, accruals = build_schedule(swap.maturity_years, swap.payments_per_year)
+    sign = 1.0 if swap.pay_fixed else -1.0
+    if projection_curve is not None:
+        fwd = forward_rates(projection_curve, swap.maturity_years, swap.payments_per_year)
+        flows = [(t, sign * swap.notional * a * f) for t, a, f in zip(pay_times, accruals, fwd)]
+    else:
+        flows = [(0.0, sign * swap.notional), (pay_times[-1], -sign * swap.notional)]
+    flows += [(t, -sign * swap.notional * swap.fixed_rate * a) for t, a in zip(pay_times, accruals)]
+    return flows
+
+
+def position_cashflows(
+    position, projection_curve: Optional[ZeroCurve] = None
+) -> List[Tuple[float, float]]:
+    """
+    Expected (time, amount) cashflows for one position.
+    Swaps are split into fixed/float legs (float coupons projected off projection_curve
+    if given); liabilities with mortality expose `expected_cashflows()`; anything else
+    falls back to `cashflows()`. Valuers whose cashflows depend on the scenario (only
+    `pv_under_shifts`) raise TypeError.
+    """
+    if isinstance(position, SizedSwap):
+        return swap_cashflows(position, projection_curve)
+    if hasattr(position, "expected_cashflows"):
+        return position.expected_cashflows()
+    if not hasattr(position, "cashflows") and hasattr(position, "pv_under_shifts"):
+        raise TypeError(
+            f"{type(position).__name__} has scenario-dependent cashflows and cannot be netted "
+            "into a static cashflow profile; use its pv/pv_under_shifts (bump-based curve_risk, "
+            "stress runners, scenario sets, historical replay, reverse_stress) instead"
+        )
+    return position.cashflows()
+
+
+@dataclass
+class CashflowProfile:
+    """Net expected cashflows of a book on one shared, sorted date grid."""
+
+    times: np.ndarray
+    amounts: np.ndarray
+
+    def discount_vector(self, curve: ZeroCurve) -> np.ndarray:
+        """DF(t) for every grid date — the only curve evaluation a book valuation needs."""
+        return curve.df_vector(self.times)
+
+    def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
+        """
+        Same calling convention as the liability classes, so curve_risk/stress accept it.
+        A flat `r` is always continuously compounded: the profile no longer knows each
+        position's `compounding`, so annual-compounding positions must be valued directly.
+        """
+        if curve is not None and r is not None:
+            raise ValueError("Provide exactly one of r or curve, not both")
+        if curve is not None:
+            return float(self.amounts @ self.discount_vector(curve))
+        if r is not None:
+            return float(self.amounts @ np.exp(-r * self.times))
+        raise ValueError("Provide exactly one of r or curve")
+
+    def pv_under_shifts(
+        self, curve: ZeroCurve, shifts_bp: np.ndarray, chunk_size: int = 4096
+    ) -> np.ndarray:
+        """
+        PV under many pillar-shift scenarios at once.
+        shifts_bp has shape (n_scenarios, len(curve.pillars)); returns shape (n_scenarios,).
+        Scenarios are processed in chunks to keep the (chunk x n_dates) DF block small.
+        """
+        shifts = np.asarray(shifts_bp, dtype=float)
+        if shifts.ndim != 2 or shifts.shape[1] != len(curve.pillars):
+            raise ValueError("shifts_bp must have shape (n_scenarios, n_pillars)")
+        weights = curve.interp_weights(self.times)  # (n_dates, n_pillars)
+        z_base = weights @ np.asarray(curve.zero_rates, dtype=float)
+        out = np.empty(shifts.shape[0])
+        for start in range(0, shifts.shape[0], chunk_size):
+            block = shifts[start : start + chunk_size] / 10000.0
+            z = z_base + block @ weights.T
+            out[start : start + chunk_size] = np.exp(-z * self.times) @ self.amounts
+        return out
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        """Persist the profile (and the book fingerprint it was built from) as .npz."""
+        np.savez(path, times=self.times, amounts=self.amounts, fingerprint=np.array(fingerprint))
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["CashflowProfile", str]:
+        """Load a profile saved with `save`; returns (profile, fingerprint)."""
+        with np.load(path) as data:
+            profile = cls(times=data["times"].copy(), amounts=data["amounts"].copy())
+            return profile, str(data["fingerprint"])
+
+
+def aggregate_cashflows(
+    positions: Iterable,
+    grid: Optional[Sequence[float]] = None,
+    projection_curve: Optional[ZeroCurve] = None,
+) -> CashflowProfile:
+    """
+    Net the cashflows of all positions onto one date grid.
+    By default the grid is the sorted union of all cashflow dates. If an explicit grid is
+    given, every cashflow must fall on one of its dates (ValueError otherwise).
+    With a projection curve, swap float coupons are projected off it and frozen, so the
+    profile then carries discount-curve risk only (use `keyrate_dv01s_dual` for both).
+    """
+    flows = [cf for pos in positions for cf in position_cashflows(pos, projection_curve)]
+    t = np.round(np.array([f[0] for f in flows], dtype=float), GRID_DECIMALS)
+    a = np.array([f[1] for f in flows], dtype=float)
+    if grid is None:
+        times, idx = np.unique(t, return_inverse=True)
+    else:
+        times = np.round(np.asarray(grid, dtype=float), GRID_DECIMALS)
+        idx = np.searchsorted(times, t)
+        idx_ok = np.minimum(idx, times.size - 1)
+        if t.size and (np.any(idx >= times.size) or np.any(times[idx_ok] != t)):
+            raise ValueError("Cashflow dates not on the supplied grid")
+    amounts = np.zeros(times.size)
+    np.add.at(amounts, idx, a)
+    return CashflowProfile(times=times, amounts=amounts)
+
+
+def as_valuer(position):
+    """
+    Something with `pv` and `pv_under_shifts` for a position: the position itself if it
+    already has `pv_under_shifts` (a CashflowProfile, or a valuer with scenario-dependent
+    cashflows such as a dynamic-lapse block), else the netted profile of the position
+    (or of a list of positions).
+    """
+    if hasattr(position, "pv_under_shifts"):
+        return position
+    if isinstance(position, (list, tuple)):
+        return aggregate_cashflows(position)
+    return aggregate_cashflows([position])
+
+
+def portfolio_fingerprint(positions: Iterable) -> str:
+    """Stable hash of the positions' fields; changes whenever any position changes."""
+    h = hashlib.sha256()
+    for pos in positions:
+        h.update(repr(pos).encode())
+    return h.hexdigest()
+
+
+class CashflowBook:
+    """
+    Liabilities plus swap hedges whose aggregated cashflow profile is built once and
+    reused until a position is added, removed, or modified (e.g. a swap is resized).
+    """
+
+    def __init__(self, positions: Optional[Iterable] = None):
+        self.positions: List = list(positions or [])
+        self._profile: Optional[CashflowProfile] = None
+        self._fingerprint = ""
+
+    def add(self, position) -> None:
+        self.positions.append(position)
+
+    def fingerprint(self) -> str:
+        return portfolio_fingerprint(self.positions)
+
+    def profile(self) -> CashflowProfile:
+        fp = self.fingerprint()
+        if self._profile is None or fp != self._fingerprint:
+            self._profile = aggregate_cashflows(self.positions)
+            self._fingerprint = fp
+        return self._profile
+
+    def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
+        return self.profile().pv(r=r, curve=curve)
+
+    def save_profile(self, path: str) -> None:
+        self.profile().save(path, fingerprint=self._fingerprint)
+
+    def load_profile(self, path: str) -> bool:
+        """Adopt a persisted profile if it was built from the current positions."""
+        profile, fp = CashflowProfile.load(path)
+        if fp != self.fingerprint():
+            return False
+        self._profile, self._fingerprint = profile, fp
+        return True
@@ -1,7 +1,9 @@
 import bisect
 import math
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
 
 
 @dataclass
@@ -32,6 +34,36 @@ class ZeroCurve:
         z = self._zero_at(t)
         return math.exp(-z * t)
 
+    def zeros_vector(self, times: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """Vectorized `_zero_at`: linear between pillars, flat beyond the ends."""
+        t = np.asarray(times, dtype=float)
+        return np.interp(t, self.pillars, self.zero_rates)
+
+    def df_vector(self, times: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """Vectorized `df` over an array of maturities (DF=1 for t <= 0)."""
+        t = np.asarray(times, dtype=float)
+        return np.where(t > 0, np.exp(-self.zeros_vector(t) * t), 1.0)
+
+    def interp_weights(self, times: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """
+        Matrix W (len(times) x len(pillars)) with z(t) = W @ zero_rates.
+        Each row holds at most two non-zero linear-interpolation weights; rows sum to 1.
+        """
+        t = np.asarray(times, dtype=float)
+        p = np.asarray(self.pillars, dtype=float)
+        w = np.zeros((t.size, p.size))
+        rows = np.arange(t.size)
+        tc = np.clip(t, p[0], p[-1])
+        hi = np.clip(np.searchsorted(p, tc, side="left"), 1, max(p.size - 1, 1))
+        if p.size == 1:
+            w[:, 0] = 1.0
+            return w
+        lo = hi - 1
+        frac = (tc - p[lo]) / (p[hi] - p[lo])
+        w[rows, lo] = 1.0 - frac
+        w[rows, hi] += frac
+        return w
+
     # helpers to make curve bumps easy
     def bumped_parallel(self, dr: float) -> "ZeroCurve":
         return ZeroCurve(self.pillars[:], [z + dr for z in self.zero_rates])
@@ -40,3 +72,10 @@ class ZeroCurve:
         z = self.zero_rates[:]
         z[idx] = z[idx] + dr
         return ZeroCurve(self.pillars[:], z)
+
+    def bumped_keys(self, bumps: Dict[int, float]) -> "ZeroCurve":
+        """Bump several pillars at once: {pillar_index: dr}."""
+        z = self.zero_rates[:]
+        for idx, dr in bumps.items():
+            z[idx] = z[idx] + dr
+        return ZeroCurve(self.pillars[:], z)
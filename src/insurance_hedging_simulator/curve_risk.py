@@ -1,5 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from .cashflows import CashflowProfile, aggregate_cashflows
 from .curve import ZeroCurve
 
 
@@ -59,3 +62,142 @@ def keyrate_dv01s(
         dv01 = (pv_dn - pv_up) / 2.0
         kr01[curve.pillars[idx]] = dv01
     return kr01
+
+
+def gamma_curve(obj, curve: ZeroCurve, bp: float = 1.0) -> float:
+    """Parallel dollar gamma: second PV difference per (1bp)^2, i.e. change in -DV01 per 1bp."""
+    dr = bp / 10000.0
+    pv0 = obj.pv(curve=curve)
+    pv_up = obj.pv(curve=curve.bumped_parallel(+dr))
+    pv_dn = obj.pv(curve=curve.bumped_parallel(-dr))
+    return (pv_up + pv_dn - 2.0 * pv0) / (bp * bp)
+
+
+def convexity_curve(obj, curve: ZeroCurve, bp: float = 1.0) -> float:
+    """Dimensionless effective convexity from parallel curve bump."""
+    dr = bp / 10000.0
+    pv0 = obj.pv(curve=curve)
+    pv_up = obj.pv(curve=curve.bumped_parallel(+dr))
+    pv_dn = obj.pv(curve=curve.bumped_parallel(-dr))
+    return (pv_up + pv_dn - 2.0 * pv0) / (pv0 * dr * dr)
+
+
+def keyrate_dv01s_and_cross_gamma(
+    obj, curve: ZeroCurve, key_indices: List[int], bp: float = 1.0
+) -> Tuple[Dict[float, float], np.ndarray]:
+    """
+    KR01s plus the pillar cross-gamma matrix (currency per bp^2) from one set of reprices.
+    The ±bp single-pillar reprices serve both the KR01s and the gamma diagonal; each
+    off-diagonal entry only adds the joint (+,+) and (-,-) bumps:
+        G_ij = [P(++) - P(i+) - P(j+) + 2 P0 - P(i-) - P(j-) + P(--)] / (2 bp^2)
+    That is 1 + 2N + N(N-1) reprices instead of 4 N^2.
+    Matrix rows/columns follow the order of key_indices.
+    """
+    dr = bp / 10000.0
+    pv0 = obj.pv(curve=curve)
+    n = len(key_indices)
+    pv_up = [obj.pv(curve=curve.bumped_key_index(idx, +dr)) for idx in key_indices]
+    pv_dn = [obj.pv(curve=curve.bumped_key_index(idx, -dr)) for idx in key_indices]
+
+    kr01 = {curve.pillars[idx]: (pv_dn[i] - pv_up[i]) / 2.0 for i, idx in enumerate(key_indices)}
+    gamma = np.zeros((n, n))
+    for i in range(n):
+        gamma[i, i] = (pv_up[i] + pv_dn[i] - 2.0 * pv0) / (bp * bp)
+        for j in range(i + 1, n):
+            a, b = key_indices[i], key_indices[j]
+            pv_uu = obj.pv(curve=curve.bumped_keys({a: +dr, b: +dr}))
+            pv_dd = obj.pv(curve=curve.bumped_keys({a: -dr, b: -dr}))
+            g = (pv_uu - pv_up[i] - pv_up[j] + 2.0 * pv0 - pv_dn[i] - pv_dn[j] + pv_dd) / (
+                2.0 * bp * bp
+            )
+            gamma[i, j] = gamma[j, i] = g
+    return kr01, gamma
+
+
+def cross_gamma_matrix(
+    obj, curve: ZeroCurve, key_indices: List[int], bp: float = 1.0
+) -> np.ndarray:
+    """Pillar cross-gamma matrix (currency per bp^2), ordered like key_indices."""
+    return keyrate_dv01s_and_cross_gamma(obj, curve, key_indices, bp)[1]
+
+
+def _as_profile(obj) -> CashflowProfile:
+    """Accept a CashflowProfile, a list of positions, or a single position."""
+    if isinstance(obj, CashflowProfile):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return aggregate_cashflows(obj)
+    return aggregate_cashflows([obj])
+
+
+def analytic_keyrate_dv01s(
+    obj, curve: ZeroCurve, key_indices: Optional[List[int]] = None
+) -> Dict[float, float]:
+    """
+    Exact KR01s for linear-interpolated zero curves (no reprices):
+    dPV/dz_k = -sum_t cf_t * t * W_tk * DF(t), reported per 1bp with the bump-and-reprice sign.
+    """
+    prof = _as_profile(obj)
+    w = curve.interp_weights(prof.times)
+    grad = (prof.amounts * prof.times * prof.discount_vector(curve)) @ w * 1e-4
+    idx = range(len(curve.pillars)) if key_indices is None else key_indices
+    return {curve.pillars[k]: float(grad[k]) for k in idx}
+
+
+def analytic_cross_gamma(
+    obj, curve: ZeroCurve, key_indices: Optional[List[int]] = None
+) -> np.ndarray:
+    """
+    Exact pillar cross-gamma (currency per bp^2) for linear-interpolated zero curves:
+    d2PV/dz_j dz_k = sum_t cf_t * t^2 * W_tj * W_tk * DF(t).
+    """
+    prof = _as_profile(obj)
+    w = curve.interp_weights(prof.times)
+    if key_indices is not None:
+        w = w[:, key_indices]
+    scale = prof.amounts * prof.times**2 * prof.discount_vector(curve) * 1e-8
+    return (w * scale[:, None]).T @ w
+
+
+def analytic_gamma(obj, curve: ZeroCurve) -> float:
+    """Exact parallel dollar gamma (currency per bp^2); interpolation weights sum to one."""
+    prof = _as_profile(obj)
+    return float(np.sum(prof.amounts * prof.times**2 * prof.discount_vector(curve)) * 1e-8)
+
+
+def keyrate_dv01s_dual(
+    obj,
+    discount_curve: ZeroCurve,
+    projection_curve: ZeroCurve,
+    discount_indices: Optional[List[int]] = None,
+    projection_indices: Optional[List[int]] = None,
+    bp: float = 1.0,
+) -> Dict[str, Dict[float, float]]:
+    """
+    KR01s of a dual-curve position (obj.pv(curve=..., projection_curve=...)) against each
+    curve's own pillars, bumping one curve at a time.
+    Returns {"discount": {tenor: kr01}, "projection": {tenor: kr01}}; all pillars by default.
+    """
+    dr = bp / 10000.0
+    disc_idx = range(len(discount_curve.pillars)) if discount_indices is None else discount_indices
+    proj_idx = (
+        range(len(projection_curve.pillars)) if projection_indices is None else projection_indices
+    )
+    out: Dict[str, Dict[float, float]] = {"discount": {}, "projection": {}}
+    for idx in disc_idx:
+        pv_up = obj.pv(
+            curve=discount_curve.bumped_key_index(idx, +dr), projection_curve=projection_curve
+        )
+        pv_dn = obj.pv(
+            curve=discount_curve.bumped_key_index(idx, -dr), projection_curve=projection_curve
+        )
+        out["discount"][discount_curve.pillars[idx]] = (pv_dn - pv_up) / 2.0
+    for idx in proj_idx:
+        pv_up = obj.pv(
+            curve=discount_curve, projection_curve=projection_curve.bumped_key_index(idx, +dr)
+        )
+        pv_dn = obj.pv(
+            curve=discount_curve, projection_curve=projection_curve.bumped_key_index(idx, -dr)
+        )
+        out["projection"][projection_curve.pillars[idx]] = (pv_dn - pv_up) / 2.0
+    return out
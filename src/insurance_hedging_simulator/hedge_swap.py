@@ -1,6 +1,9 @@
 import math
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from .curve import ZeroCurve
 
@@ -21,12 +24,84 @@ def swap_annuity(curve: ZeroCurve, pay_times: List[float], accruals: List[float]
     return sum(a * curve.df(t) for t, a in zip(pay_times, accruals))
 
 
-def par_swap_rate(curve: ZeroCurve, maturity_years: int, payments_per_year: int = 1) -> float:
-    """K = (1 - DF(T)) / annuity."""
-    pay_times, accruals = build_schedule(maturity_years, payments_per_year)
-    ann = swap_annuity(curve, pay_times, accruals)
-    T = pay_times[-1]
-    return (1.0 - curve.df(T)) / ann
+@lru_cache(maxsize=256)
+def _schedule_grid(
+    maturity_years: int, payments_per_year: int, pillars: Tuple[float, ...], start: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Times [s, s + t_1, ..., s + t_n] of a schedule starting at s and their interpolation
+    weights on the pillars (rates-free).
+    """
+    pay_times, _ = build_schedule(maturity_years, payments_per_year)
+    times = start + np.array([0.0] + pay_times)
+    weights = ZeroCurve(list(pillars), [0.0] * len(pillars)).interp_weights(times)
+    times.flags.writeable = False
+    weights.flags.writeable = False
+    return times, weights
+
+
+@lru_cache(maxsize=1024)
+def _schedule_dfs(
+    maturity_years: int,
+    payments_per_year: int,
+    pillars: Tuple[float, ...],
+    zero_rates: Tuple[float, ...],
+    start: float = 0.0,
+) -> np.ndarray:
+    times, weights = _schedule_grid(maturity_years, payments_per_year, pillars, start)
+    dfs = np.exp(-(weights @ np.asarray(zero_rates, dtype=float)) * times)
+    dfs.flags.writeable = False  # shared through the cache
+    return dfs
+
+
+def schedule_dfs(
+    curve: ZeroCurve, maturity_years: int, payments_per_year: int = 1, start: float = 0.0
+) -> np.ndarray:
+    """
+    DFs at [s, s + t_1, ..., s + t_n] of a schedule starting at s (spot-start by default;
+    a deferred annuity starts at its deferral), cached per (schedule, curve).
+    Swaps sharing a schedule share one DF grid, and bumping one curve of a dual-curve
+    setup leaves the other curve's cached grids untouched. A bumped curve misses the DF
+    cache, but its schedule times and interpolation weights (keyed on pillars only) are
+    reused, so the miss costs one small matrix-vector product.
+    """
+    return _schedule_dfs(
+        maturity_years,
+        payments_per_year,
+        tuple(curve.pillars),
+        tuple(curve.zero_rates),
+        float(start),
+    )
+
+
+def forward_rates(
+    projection_curve: ZeroCurve, maturity_years: int, payments_per_year: int = 1
+) -> np.ndarray:
+    """Simple forward per period: F_i = (DF_p(t_{i-1}) / DF_p(t_i) - 1) / accrual_i."""
+    _, accruals = build_schedule(maturity_years, payments_per_year)
+    dfs = schedule_dfs(projection_curve, maturity_years, payments_per_year)
+    return (dfs[:-1] / dfs[1:] - 1.0) / np.asarray(accruals)
+
+
+def par_swap_rate(
+    curve: ZeroCurve,
+    maturity_years: int,
+    payments_per_year: int = 1,
+    projection_curve: Optional[ZeroCurve] = None,
+) -> float:
+    """
+    K = (1 - DF(T)) / annuity on a single curve.
+    With a projection curve (dual curve, `curve` discounts):
+    K = sum_i acc_i F_i DF_d(t_i) / sum_i acc_i DF_d(t_i).
+    """
+    if projection_curve is not None:
+        _, accruals = build_schedule(maturity_years, payments_per_year)
+        acc_df = np.asarray(accruals) * schedule_dfs(curve, maturity_years, payments_per_year)[1:]
+        fwd = forward_rates(projection_curve, maturity_years, payments_per_year)
+        return float(acc_df @ fwd / acc_df.sum())
+    _, accruals = build_schedule(maturity_years, payments_per_year)
+    dfs = schedule_dfs(curve, maturity_years, payments_per_year)
+    return float((1.0 - dfs[-1]) / (np.asarray(accruals) @ dfs[1:]))
 
 
 def swap_pv_payer_fixed(
@@ -35,18 +110,25 @@ def swap_pv_payer_fixed(
     maturity_years: int,
     payments_per_year: int,
     fixed_rate: float,
+    projection_curve: Optional[ZeroCurve] = None,
 ) -> float:
     """
     PV(payer fixed) = PV(float) - PV(fixed).
     PV(float) ~ notional * (1 - DF(T)) for a spot-start par-style swap.
     PV(fixed) = notional * K * annuity(shocked curve).
+    With a projection curve, `curve` is the (OIS) discount curve and the float leg is
+    sum_i notional * acc_i * F_i * DF_d(t_i) with forwards F_i off the projection curve.
     """
-    pay_times, accruals = build_schedule(maturity_years, payments_per_year)
-    T = pay_times[-1]
-    ann = swap_annuity(curve, pay_times, accruals)
-    pv_float = notional * (1.0 - curve.df(T))
-    pv_fixed = notional * fixed_rate * ann
-    return pv_float - pv_fixed
+    if projection_curve is not None:
+        _, accruals = build_schedule(maturity_years, payments_per_year)
+        acc_df = np.asarray(accruals) * schedule_dfs(curve, maturity_years, payments_per_year)[1:]
+        fwd = forward_rates(projection_curve, maturity_years, payments_per_year)
+        return float(notional * (acc_df @ fwd - fixed_rate * acc_df.sum()))
+    _, accruals = build_schedule(maturity_years, payments_per_year)
+    dfs = schedule_dfs(curve, maturity_years, payments_per_year)
+    pv_float = notional * (1.0 - dfs[-1])
+    pv_fixed = notional * fixed_rate * (np.asarray(accruals) @ dfs[1:])
+    return float(pv_float - pv_fixed)
 
 
 @dataclass
@@ -57,10 +139,11 @@ class SizedSwap:
     notional: float
     fixed_rate: float  # locked at base par
 
-    def pv(self, curve: ZeroCurve) -> float:
+    def pv(self, curve: ZeroCurve, projection_curve: Optional[ZeroCurve] = None) -> float:
         """
         PV for this swap under the given curve. Uses the same payer-fixed
         pricing function and flips the sign if this is receiver-fixed.
+        Pass projection_curve for dual-curve pricing (curve then only discounts).
         """
         base = swap_pv_payer_fixed(
             curve=curve,
@@ -68,6 +151,7 @@ class SizedSwap:
             maturity_years=self.maturity_years,
             payments_per_year=self.payments_per_year,
             fixed_rate=self.fixed_rate,
+            projection_curve=projection_curve,
         )
         return base if self.pay_fixed else -base
 
@@ -77,16 +161,18 @@ def size_dv01_hedge_payer_fixed(
     curve: ZeroCurve,
     maturity_years: int = 10,
     payments_per_year: int = 1,
+    projection_curve: Optional[ZeroCurve] = None,
 ) -> SizedSwap:
     """
     For MVP: DV01 per unit notional of a par swap ≈ swap annuity (sign depends on side).
     If liability DV01 > 0, we choose payer-fixed (negative DV01) to offset it.
+    With a projection curve the fixed rate is the dual-curve par rate.
     """
     pay_times, accruals = build_schedule(maturity_years, payments_per_year)
     ann = swap_annuity(curve, pay_times, accruals)
     dv01_per_notional = ann / 10000.0  # <-- convert bp to decimal
     notional = liability_dv01 / dv01_per_notional
-    fixed = par_swap_rate(curve, maturity_years, payments_per_year)
+    fixed = par_swap_rate(curve, maturity_years, payments_per_year, projection_curve)
     return SizedSwap(
         maturity_years=maturity_years,
         payments_per_year=payments_per_year,
@@ -0,0 +1,212 @@
+import bisect
+import math
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .cashflows import CashflowProfile, aggregate_cashflows, as_valuer
+from .curve import ZeroCurve
+from .stress import HedgeType, hedge_list
+
+
+class RollingVaR:
+    """
+    Loss window kept sorted, so each one-in/one-out update is a bisect insert/remove and
+    VaR/ES read the tail directly instead of re-sorting the whole window.
+    VaR is the k-th largest loss and ES the mean of the k largest, k = ceil((1 - conf) * n).
+    """
+
+    def __init__(self, window: int, confidence: float = 0.99):
+        if window < 1 or not 0.0 < confidence < 1.0:
+            raise ValueError("window must be >= 1 and 0 < confidence < 1")
+        self.window = window
+        self.confidence = confidence
+        self._fifo: deque = deque()
+        self._sorted: List[float] = []
+
+    def push(self, loss: float) -> None:
+        self._fifo.append(loss)
+        bisect.insort(self._sorted, loss)
+        if len(self._fifo) > self.window:
+            old = self._fifo.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+    @property
+    def full(self) -> bool:
+        return len(self._fifo) == self.window
+
+    def _k(self) -> int:
+        # round first so e.g. (1 - 0.99) * 100 does not ceil to 2
+        return max(1, math.ceil(round((1.0 - self.confidence) * len(self._sorted), 9)))
+
+    @property
+    def var(self) -> float:
+        return self._sorted[-self._k()]
+
+    @property
+    def es(self) -> float:
+        k = self._k()
+        return sum(self._sorted[-k:]) / k
+
+
+class HistoricalReplay:
+    """
+    Historical-simulation VaR of liability + swap hedges: every daily pillar change in a
+    zero-rate history (n_days x n_pillars, decimal, on the base curve's pillars) is applied
+    to today's curve. All scenarios are valued in one batch through netted cashflow
+    profiles; the rolling window then only moves one scenario in and one out per day.
+    """
+
+    def __init__(
+        self,
+        liability,
+        base_curve: ZeroCurve,
+        sized_swap: HedgeType,
+        dates: Sequence,
+        zero_history: np.ndarray,
+        window: int = 250,
+        confidence: float = 0.99,
+    ):
+        hist = np.asarray(zero_history, dtype=float)
+        if hist.ndim != 2 or hist.shape[1] != len(base_curve.pillars):
+            raise ValueError("zero_history must have shape (n_days, n_pillars)")
+        if len(dates) != hist.shape[0]:
+            raise ValueError("one date per history row is required")
+        self.base_curve = base_curve
+        self.window = window
+        self.confidence = confidence
+        self._liab = as_valuer(liability)
+        swaps = hedge_list(sized_swap)
+        self._hedge: Optional[CashflowProfile] = aggregate_cashflows(swaps) if swaps else None
+        self._base_liab = self._liab.pv(curve=base_curve)
+        self._base_hedge = self._hedge.pv(curve=base_curve) if self._hedge is not None else 0.0
+
+        self.dates: List = list(dates[1:])
+        self._last_zeros = hist[-1].copy()
+        shifts = np.diff(hist, axis=0) * 10000.0
+        liab, hedge = self._value(shifts)
+        # preallocated buffers, doubled when full, so `advance` appends in amortized O(1)
+        self._n = shifts.shape[0]
+        cap = max(2 * self._n, 16)
+        self._shifts = np.empty((cap, shifts.shape[1]))
+        self._liab_pnl = np.empty(cap)
+        self._hedge_pnl = np.empty(cap)
+        self._shifts[: self._n], self._liab_pnl[: self._n], self._hedge_pnl[: self._n] = (
+            shifts,
+            liab,
+            hedge,
+        )
+        self._rolling = self._primed_window()
+
+    def _value(self, shifts_bp: np.ndarray):
+        liab = self._liab.pv_under_shifts(self.base_curve, shifts_bp) - self._base_liab
+        hedge = np.zeros(shifts_bp.shape[0])
+        if self._hedge is not None:
+            hedge = self._hedge.pv_under_shifts(self.base_curve, shifts_bp) - self._base_hedge
+        return liab, hedge
+
+    def _primed_window(self) -> RollingVaR:
+        """A window holding the last `window` net P&Ls of the history so far."""
+        rolling = RollingVaR(self.window, self.confidence)
+        for pnl in self.net_pnl[-self.window :]:
+            rolling.push(-float(pnl))
+        return rolling
+
+    @property
+    def shifts_bp(self) -> np.ndarray:
+        return self._shifts[: self._n]
+
+    @property
+    def liability_pnl(self) -> np.ndarray:
+        return self._liab_pnl[: self._n]
+
+    @property
+    def hedge_pnl(self) -> np.ndarray:
+        return self._hedge_pnl[: self._n]
+
+    @property
+    def net_pnl(self) -> np.ndarray:
+        return self.liability_pnl + self.hedge_pnl
+
+    def rolling_var(self) -> List[Dict]:
+        """
+        VaR/ES of the net position (as positive losses) for every full window over the
+        history, updated incrementally. Rows are keyed by the window's last scenario date.
+        """
+        self._rolling = RollingVaR(self.window, self.confidence)
+        rows = []
+        for date, pnl in zip(self.dates, self.net_pnl):
+            self._rolling.push(-float(pnl))
+            if self._rolling.full:
+                rows.append({"date": date, "var": self._rolling.var, "es": self._rolling.es})
+        return rows
+
+    def advance(self, date, zero_rates: Sequence[float]) -> Dict:
+        """
+        Append one new day of zero rates: value only the new daily shift, push it into the
+        window (dropping the oldest) and return the updated VaR/ES row. The window is primed
+        with the existing history at construction, so no earlier call is needed.
+        """
+        zeros = np.asarray(zero_rates, dtype=float)
+        shift = ((zeros - self._last_zeros) * 10000.0)[None, :]
+        liab, hedge = self._value(shift)
+        self._last_zeros = zeros
+        self.dates.append(date)
+        if self._n == self._liab_pnl.size:
+            cap = 2 * self._n
+            self._shifts = np.resize(self._shifts, (cap, self._shifts.shape[1]))
+            self._liab_pnl = np.resize(self._liab_pnl, cap)
+            self._hedge_pnl = np.resize(self._hedge_pnl, cap)
+        self._shifts[self._n], self._liab_pnl[self._n], self._hedge_pnl[self._n] = (
+            shift[0],
+            liab[0],
+            hedge[0],
+        )
+        self._n += 1
+        self._rolling.push(-float(liab[0] + hedge[0]))
+        return {"date": date, "var": self._rolling.var, "es": self._rolling.es}
+
+
+def hedge_effectiveness_backtest(
+    liability,
+    sized_swap: HedgeType,
+    pillars: Sequence[float],
+    dates: Sequence,
+    zero_history: np.ndarray,
+) -> Dict:
+    """
+    Daily realized P&L of liability and (static) hedge along the actual curve history.
+    Returns {"rows": [{date, liability_pnl, hedge_pnl, net_pnl}], "summary": {...}} where
+    the summary has the variance reduction 1 - Var(net)/Var(liability), the regression
+    hedge ratio of hedge P&L on liability P&L (-1 is a perfect offset) and its R^2.
+    """
+    hist = np.asarray(zero_history, dtype=float)
+    if hist.ndim != 2 or hist.shape[1] != len(pillars) or len(dates) != hist.shape[0]:
+        raise ValueError("zero_history must have shape (len(dates), len(pillars))")
+    first = ZeroCurve(list(pillars), hist[0].tolist())
+    shifts = (hist - hist[0]) * 10000.0  # every day's curve relative to the first one
+
+    liab_pv = as_valuer(liability).pv_under_shifts(first, shifts)
+    swaps = hedge_list(sized_swap)
+    hedge_pv = np.zeros(hist.shape[0])
+    if swaps:
+        hedge_pv = aggregate_cashflows(swaps).pv_under_shifts(first, shifts)
+    liab_pnl, hedge_pnl = np.diff(liab_pv), np.diff(hedge_pv)
+    net_pnl = liab_pnl + hedge_pnl
+
+    rows = [
+        {"date": d, "liability_pnl": float(lp), "hedge_pnl": float(hp), "net_pnl": float(lp + hp)}
+        for d, lp, hp in zip(list(dates)[1:], liab_pnl, hedge_pnl)
+    ]
+    var_liab = float(np.var(liab_pnl))
+    cov = np.cov(hedge_pnl, liab_pnl, ddof=0)
+    ratio = float(cov[0, 1] / var_liab) if var_liab else 0.0
+    corr = np.corrcoef(hedge_pnl, liab_pnl)[0, 1] if var_liab and np.var(hedge_pnl) else 0.0
+    summary = {
+        "variance_reduction": 1.0 - float(np.var(net_pnl)) / var_liab if var_liab else 0.0,
+        "hedge_ratio": ratio,
+        "r_squared": float(corr**2),
+        "n_days": float(len(rows)),
+    }
+    return {"rows": rows, "summary": summary}
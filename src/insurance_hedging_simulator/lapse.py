@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .curve import ZeroCurve
+from .liabilities import DeferredAnnuityCertain, GompertzMakeham
+
+
+@dataclass
+class DynamicLapse:
+    """
+    Annual surrender rate that reacts to the gap between market and credited rates:
+        rate = base_rate * clip(1 + sensitivity * (market - credited - threshold), floor, cap)
+    market is the forward `reference_tenor` zero rate starting at each step, read off the
+    scenario curve; rates are decimals, so sensitivity=20 means +20% per 1% of spread.
+    """
+
+    base_rate: float = 0.05
+    sensitivity: float = 20.0
+    threshold: float = 0.0
+    floor_multiplier: float = 0.5
+    cap_multiplier: float = 4.0
+    reference_tenor: float = 5.0
+
+    def multiplier(self, spread: np.ndarray) -> np.ndarray:
+        m = 1.0 + self.sensitivity * (np.asarray(spread, dtype=float) - self.threshold)
+        return np.clip(m, self.floor_multiplier, self.cap_multiplier)
+
+    def annual_rate(self, market: np.ndarray, credited: np.ndarray) -> np.ndarray:
+        return np.clip(self.base_rate * self.multiplier(market - credited), 0.0, 1.0)
+
+
+@dataclass
+class DeferredAnnuityBlock:
+    """
+    A block of deferred annuities sharing `product`'s terms, one row per policy group
+    (issue age, credited rate, current cash value, policy count).
+
+    In-force decrements combine Gompertz–Makeham mortality with dynamic lapse during
+    deferral; a lapse pays the cash value, credited continuously from today. After the
+    deferral the in-force receive `product`'s installments. Because lapse rates depend on
+    each scenario's forward rates, cashflows differ by scenario: values are computed on
+    (scenarios x policies x time) arrays, as many scenarios at a time as fit `chunk_size`.
+    """
+
+    product: DeferredAnnuityCertain
+    issue_ages: Sequence[float]
+    credited_rates: Sequence[float]
+    cash_values: Sequence[float]
+    counts: Optional[Sequence[float]] = None
+    mortality: GompertzMakeham = field(default_factory=GompertzMakeham)
+    lapse: DynamicLapse = field(default_factory=DynamicLapse)
+
+    def __post_init__(self):
+        n = len(self.issue_ages)
+        if len(self.credited_rates) != n or len(self.cash_values) != n:
+            raise ValueError("issue_ages, credited_rates and cash_values must align")
+        if self.counts is not None and len(self.counts) != n:
+            raise ValueError("one count per policy group is required")
+
+    def _grid(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Scenario-independent inputs: times, step survival, deferral mask, CV path, payments."""
+        m = self.product.payments_per_year
+        n_steps = int(round((self.product.defer_years + self.product.n_payments) * m))
+        times = np.arange(1, n_steps + 1) / m
+        grid_t = tuple(float(t) for t in np.concatenate([[0.0], times]))
+        surv = self.mortality.survival_grid(tuple(float(a) for a in self.issue_ages), grid_t)
+        step_surv = surv[:, 1:] / surv[:, :-1]  # (P, T)
+        deferral = times <= self.product.defer_years + 1e-12
+        credited = np.asarray(self.credited_rates, dtype=float)
+        cv = np.asarray(self.cash_values, dtype=float)[:, None] * np.exp(
+            credited[:, None] * times[None, :]
+        )
+        payments = np.where(deferral, 0.0, self.product.payment / m)
+        return times, step_surv, deferral, cv, payments
+
+    def _counts(self) -> np.ndarray:
+        if self.counts is None:
+            return np.ones(len(self.issue_ages))
+        return np.asarray(self.counts, dtype=float)
+
+    def projection(
+        self, curve: ZeroCurve, shifts_bp: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (times, in_force, cashflows) for a block of scenarios: policy counts in force and
+        expected cashflows (surrender + annuity), summed over the policy groups, each of
+        shape (scenarios x time). The per-policy decrements are built in place, so a call
+        holds two (scenarios x policies x time) arrays at a time.
+        """
+        times, step_surv, deferral, cv, payments = self._grid()
+        counts = self._counts()
+        shifts = np.atleast_2d(np.asarray(shifts_bp, dtype=float))
+        zero_rates = np.asarray(curve.zero_rates, dtype=float)[None, :] + shifts / 10000.0
+
+        # forward reference-tenor rate starting at the beginning of each step
+        starts = times - times[0]
+        tau = self.lapse.reference_tenor
+        z_start = zero_rates @ curve.interp_weights(starts).T  # (S, T)
+        z_end = zero_rates @ curve.interp_weights(starts + tau).T
+        market = (z_end * (starts + tau) - z_start * starts) / tau
+
+        dt = times[0]
+        credited = np.asarray(self.credited_rates, dtype=float)
+        q = self.lapse.annual_rate(market[:, None, :], credited[None, :, None])  # (S, P, T)
+        np.subtract(1.0, q, out=q)
+        np.power(q, dt, out=q)
+        np.subtract(1.0, q, out=q)
+        q[:, :, ~deferral] = 0.0
+        in_force = np.subtract(1.0, q)
+        in_force *= step_surv
+        np.cumprod(in_force, axis=-1, out=in_force)
+        # surrenders: in force at the start of the step, surviving it, then lapsing
+        q *= step_surv
+        q[..., 1:] *= in_force[..., :-1]
+        surrenders = np.einsum("p,pt,spt->st", counts, cv, q)
+        total = np.einsum("p,spt->st", counts, in_force)
+        return times, total, surrenders + total * payments
+
+    def pv_under_shifts(
+        self, curve: ZeroCurve, shifts_bp: np.ndarray, chunk_size: int = 1 << 21
+    ) -> np.ndarray:
+        """
+        Block PV under many pillar-shift scenarios (n_scenarios x n_pillars, bp), shape
+        (n_scenarios,). Same signature as `CashflowProfile.pv_under_shifts`, so the scenario
+        engines can use the block in place of a static cashflow profile. Scenarios are
+        projected in batches of about `chunk_size` (scenarios x policies x time) cells, so
+        memory stays bounded however many policy groups and payment steps the block has.
+        """
+        shifts = np.asarray(shifts_bp, dtype=float)
+        if shifts.ndim != 2 or shifts.shape[1] != len(curve.pillars):
+            raise ValueError("shifts_bp must have shape (n_scenarios, n_pillars)")
+        m = self.product.payments_per_year
+        n_steps = int(round((self.product.defer_years + self.product.n_payments) * m))
+        step = max(1, chunk_size // max(len(self.issue_ages) * n_steps, 1))
+        out = np.empty(shifts.shape[0])
+        weights = None
+        for start in range(0, shifts.shape[0], step):
+            block = shifts[start : start + step]
+            times, _, cashflows = self.projection(curve, block)
+            if weights is None:
+                weights = curve.interp_weights(times)
+            z = (np.asarray(curve.zero_rates, dtype=float) + block / 10000.0) @ weights.T
+            out[start : start + step] = np.sum(cashflows * np.exp(-z * times), axis=1)
+        return out
+
+    def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
+        # r is a flat continuously compounded rate used for both lapse and discounting
+        if curve is not None and r is not None:
+            raise ValueError("Provide exactly one of r or curve, not both")
+        if r is not None:
+            curve = ZeroCurve([1.0], [r])
+        if curve is None:
+            raise ValueError("Provide exactly one of r or curve")
+        return float(self.pv_under_shifts(curve, np.zeros((1, len(curve.pillars))))[0])
@@ -1,9 +1,14 @@
 # src/insurance_hedging_simulator/liabilities.py
 import math
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Literal, Optional, Tuple, overload
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, overload
+
+import numpy as np
 
 from .curve import ZeroCurve
+from .hedge_swap import build_schedule, schedule_dfs
 
 Compounding = Literal["continuous", "annual"]
 
@@ -19,15 +24,85 @@ def discount_factor(t: float, r: float, compounding: Compounding = "continuous")
     raise ValueError("Unsupported compounding")
 
 
+@lru_cache(maxsize=256)
+def _payment_schedule(
+    n_years: int, payments_per_year: int, defer_years: float
+) -> Tuple[Tuple[float, ...], np.ndarray]:
+    """`build_schedule` pay times shifted by the deferral: a tuple (hashable) and an array."""
+    if payments_per_year < 1:
+        raise ValueError("payments_per_year must be >= 1")
+    pay_times, _ = build_schedule(n_years, payments_per_year)
+    times = tuple(defer_years + t for t in pay_times)
+    arr = np.array(times, dtype=float)
+    arr.flags.writeable = False  # shared through the cache
+    return times, arr
+
+
+def payment_schedule(
+    n_years: int, payments_per_year: int = 1, defer_years: float = 0
+) -> np.ndarray:
+    """
+    Payment times defer + k/m, k = 1..n_years*m, of an annuity paid m times a year in
+    arrear. Cached per (term, frequency, deferral) and read-only.
+    """
+    return _payment_schedule(n_years, payments_per_year, defer_years)[1]
+
+
+@lru_cache(maxsize=1024)
+def _flat_schedule_dfs(
+    n_years: int, payments_per_year: int, defer_years: float, r: float, compounding: Compounding
+) -> np.ndarray:
+    t = payment_schedule(n_years, payments_per_year, defer_years)
+    if compounding == "continuous":
+        dfs = np.exp(-r * t)
+    elif compounding == "annual":
+        dfs = (1.0 + r) ** (-t)
+    else:
+        raise ValueError("Unsupported compounding")
+    dfs.flags.writeable = False
+    return dfs
+
+
+def _schedule_pv(
+    amounts: np.ndarray,
+    n_years: int,
+    payments_per_year: int,
+    defer_years: float,
+    r: Optional[float],
+    curve: Optional[ZeroCurve],
+    compounding: Compounding,
+) -> float:
+    """amounts @ DF over a cached schedule, with the usual exactly-one-of r/curve guard."""
+    if curve is not None and r is not None:
+        raise ValueError("Provide exactly one of r or curve, not both")
+    if curve is not None:
+        dfs = schedule_dfs(curve, n_years, payments_per_year, start=defer_years)[1:]
+        return float(amounts @ dfs)
+    if r is not None:
+        dfs = _flat_schedule_dfs(n_years, payments_per_year, defer_years, r, compounding)
+        return float(amounts @ dfs)
+    raise ValueError("Provide exactly one of r or curve")
+
+
 @dataclass
 class AnnuityCertain:
+    """
+    `payment` per year for `n_payments` years, paid in arrear in `payments_per_year`
+    equal installments (1 = annual, 4 = quarterly, 12 = monthly).
+    """
+
     payment: float
     n_payments: int
     compounding: Compounding = "continuous"
+    payments_per_year: int = 1
+
+    def payment_times(self) -> np.ndarray:
+        return payment_schedule(self.n_payments, self.payments_per_year)
 
     def cashflows(self) -> List[Tuple[float, float]]:
-        # (time in years, amount), end-of-period payments at t = 1..N
-        return [(t, self.payment) for t in range(1, self.n_payments + 1)]
+        # (time in years, amount), end-of-period installments up to t = N
+        amount = self.payment / self.payments_per_year
+        return [(t, amount) for t in self.payment_times().tolist()]
 
     # Overloads tell the type checker exactly how this is used.
     @overload
@@ -36,27 +111,27 @@ class AnnuityCertain:
     def pv(self, r: None = ..., curve: ZeroCurve = ...) -> float: ...
 
     def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
-        # Runtime guards that line up with the overloads
-        if curve is not None and r is not None:
-            raise ValueError("Provide exactly one of r or curve, not both")
-        if curve is not None:
-            return sum(cf * curve.df(t) for t, cf in self.cashflows())
-        if r is not None:
-            return sum(cf * discount_factor(t, r, self.compounding) for t, cf in self.cashflows())
-        raise ValueError("Provide exactly one of r or curve")
+        m = self.payments_per_year
+        amounts = np.full(self.n_payments * m, self.payment / m)
+        return _schedule_pv(amounts, self.n_payments, m, 0, r, curve, self.compounding)
 
 
 @dataclass
 class DeferredAnnuityCertain:
+    """Like `AnnuityCertain`, with the first installment period starting after defer_years."""
+
     payment: float
     n_payments: int
     defer_years: int
     compounding: Compounding = "continuous"
+    payments_per_year: int = 1
+
+    def payment_times(self) -> np.ndarray:
+        return payment_schedule(self.n_payments, self.payments_per_year, self.defer_years)
 
     def cashflows(self) -> List[Tuple[float, float]]:
-        start = self.defer_years + 1
-        end = self.defer_years + self.n_payments
-        return [(t, self.payment) for t in range(start, end + 1)]
+        amount = self.payment / self.payments_per_year
+        return [(t, amount) for t in self.payment_times().tolist()]
 
     @overload
     def pv(self, r: float, curve: None = ...) -> float: ...
@@ -64,13 +139,11 @@ class DeferredAnnuityCertain:
     def pv(self, r: None = ..., curve: ZeroCurve = ...) -> float: ...
 
     def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
-        if curve is not None and r is not None:
-            raise ValueError("Provide exactly one of r or curve, not both")
-        if curve is not None:
-            return sum(cf * curve.df(t) for t, cf in self.cashflows())
-        if r is not None:
-            return sum(cf * discount_factor(t, r, self.compounding) for t, cf in self.cashflows())
-        raise ValueError("Provide exactly one of r or curve")
+        m = self.payments_per_year
+        amounts = np.full(self.n_payments * m, self.payment / m)
+        return _schedule_pv(
+            amounts, self.n_payments, m, self.defer_years, r, curve, self.compounding
+        )
 
 
 @dataclass
@@ -81,46 +154,215 @@ class GompertzMakeham:
     c: float = 1.08
 
     def survival(self, x: float, t: float) -> float:
-        """{}_{t}p_x = exp( -A t - (B/ln c) * (c^{x+t} - c^{x}) )."""
+        """
+        {}_{t}p_x = exp( -A t - (B/ln c) * (c^{x+t} - c^{x}) ).
+        The hazard is continuous in age, so fractional x and t (e.g. monthly durations)
+        are exact rather than interpolated between integer ages.
+        """
         if t <= 0:
             return 1.0
         if self.c <= 0 or self.c == 1.0:
             raise ValueError("c must be > 0 and != 1")
         return math.exp(-self.A * t - (self.B / math.log(self.c)) * (self.c ** (x + t) - self.c**x))
 
+    def survival_grid(self, ages: Sequence[float], times: Sequence[float]) -> np.ndarray:
+        """Vectorized `survival`: (len(ages) x len(times)) grid of {}_{t}p_x, cached."""
+        return _survival_grid(self.A, self.B, self.c, tuple(ages), tuple(times))
+
+
+@lru_cache(maxsize=256)
+def _survival_grid(
+    A: float, B: float, c: float, ages: Tuple[float, ...], times: Tuple[float, ...]
+) -> np.ndarray:
+    if c <= 0 or c == 1.0:
+        raise ValueError("c must be > 0 and != 1")
+    x = np.asarray(ages, dtype=float)[:, None]
+    t = np.maximum(np.asarray(times, dtype=float)[None, :], 0.0)
+    grid = np.exp(-A * t - (B / math.log(c)) * (c ** (x + t) - c**x))
+    grid.flags.writeable = False  # shared through the cache
+    return grid
+
+
+@lru_cache(maxsize=128)
+def _two_life_grids(
+    m1: Tuple[float, float, float],
+    m2: Tuple[float, float, float],
+    ages1: Tuple[float, ...],
+    ages2: Tuple[float, ...],
+    times: Tuple[float, ...],
+) -> Dict[str, np.ndarray]:
+    p1 = _survival_grid(*m1, ages1, times)
+    p2 = _survival_grid(*m2, ages2, times)
+    joint = p1[:, None, :] * p2[None, :, :]  # independent lives
+    grids = {
+        "life_1": p1[:, None, :],
+        "life_2": p2[None, :, :],
+        "joint": joint,
+        "last_survivor": p1[:, None, :] + p2[None, :, :] - joint,
+    }
+    for g in grids.values():
+        g.flags.writeable = False
+    return grids
+
+
+def two_life_survival_grids(
+    mortality_1: GompertzMakeham,
+    mortality_2: GompertzMakeham,
+    ages_1: Sequence[float],
+    ages_2: Sequence[float],
+    times: Sequence[float],
+) -> Dict[str, np.ndarray]:
+    """
+    Survival grids over (life-1 age x life-2 age x duration), assuming independent lives.
+    Keys: "joint" (both alive), "last_survivor" (at least one alive), and "life_1" /
+    "life_2" broadcastable against them. Results are cached and read-only.
+    """
+    m1 = (mortality_1.A, mortality_1.B, mortality_1.c)
+    m2 = (mortality_2.A, mortality_2.B, mortality_2.c)
+    return _two_life_grids(m1, m2, tuple(ages_1), tuple(ages_2), tuple(times))
+
 
 @dataclass
 class LifeAnnuityImmediate:
+    """
+    `payment` per year while the annuitant survives, for at most `n_payments` years, paid
+    in arrear in `payments_per_year` installments each conditional on survival to its date.
+    """
+
     payment: float
     n_payments: int
     issue_age: float
     mortality: GompertzMakeham = field(default_factory=GompertzMakeham)
     compounding: Compounding = "continuous"
+    payments_per_year: int = 1
+
+    def payment_times(self) -> np.ndarray:
+        return payment_schedule(self.n_payments, self.payments_per_year)
+
+    def survival_vector(self) -> np.ndarray:
+        """{}_{t}p_x at every payment time (fractional durations), cached."""
+        times, _ = _payment_schedule(self.n_payments, self.payments_per_year, 0)
+        return self.mortality.survival_grid((self.issue_age,), times)[0]
+
+    def cashflows(self) -> List[Tuple[float, float]]:
+        # unweighted cash flows; survival applied in PV
+        amount = self.payment / self.payments_per_year
+        return [(t, amount) for t in self.payment_times().tolist()]
+
+    def expected_cashflows(self) -> List[Tuple[float, float]]:
+        # survival-weighted cash flows, i.e. what the PV actually discounts
+        amounts = self.payment / self.payments_per_year * self.survival_vector()
+        return list(zip(self.payment_times().tolist(), amounts.tolist()))
+
+    @overload
+    def pv(self, r: float, curve: None = ...) -> float: ...
+    @overload
+    def pv(self, r: None = ..., curve: ZeroCurve = ...) -> float: ...
+
+    def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
+        m = self.payments_per_year
+        amounts = self.payment / m * self.survival_vector()
+        return _schedule_pv(amounts, self.n_payments, m, 0, r, curve, self.compounding)
+
+
+def life_annuity_pv_grid(
+    product: LifeAnnuityImmediate, ages: Sequence[float], curve: ZeroCurve
+) -> np.ndarray:
+    """
+    PV of `product` re-priced for every issue age in `ages`, shape (len(ages),): one cached
+    survival grid and one cached DF vector, whatever the payment frequency.
+    """
+    m = product.payments_per_year
+    times, _ = _payment_schedule(product.n_payments, m, 0)
+    surv = product.mortality.survival_grid(tuple(ages), times)
+    dfs = schedule_dfs(curve, product.n_payments, m)[1:]
+    return product.payment / m * surv @ dfs
+
+
+@dataclass
+class _TwoLifeAnnuity(ABC):
+    """Annual two-life annuity; subclasses define which survival states receive `payment`."""
+
+    payment: float
+    n_payments: int
+    issue_age_1: float
+    issue_age_2: float
+    mortality_1: GompertzMakeham = field(default_factory=GompertzMakeham)
+    mortality_2: GompertzMakeham = field(default_factory=GompertzMakeham)
+    compounding: Compounding = "continuous"
+
+    @abstractmethod
+    def _payment_weight(self, grids: Dict[str, np.ndarray]) -> np.ndarray:
+        """Expected fraction of `payment` made at each duration, shape (n1, n2, T)."""
 
     def cashflows(self) -> List[Tuple[float, float]]:
         # unweighted cash flows; survival applied in PV
         return [(t, self.payment) for t in range(1, self.n_payments + 1)]
 
+    def _weights(self) -> np.ndarray:
+        times, _ = _payment_schedule(self.n_payments, 1, 0)
+        grids = two_life_survival_grids(
+            self.mortality_1, self.mortality_2, (self.issue_age_1,), (self.issue_age_2,), times
+        )
+        return self._payment_weight(grids)[0, 0]
+
+    def expected_cashflows(self) -> List[Tuple[float, float]]:
+        times = payment_schedule(self.n_payments)
+        return list(zip(times.tolist(), (self.payment * self._weights()).tolist()))
+
     @overload
     def pv(self, r: float, curve: None = ...) -> float: ...
     @overload
     def pv(self, r: None = ..., curve: ZeroCurve = ...) -> float: ...
 
     def pv(self, r: Optional[float] = None, curve: Optional[ZeroCurve] = None) -> float:
-        if curve is not None and r is not None:
-            raise ValueError("Provide exactly one of r or curve, not both")
-
-        pv_val = 0.0
-        if curve is not None:
-            for t, cf in self.cashflows():
-                surv = self.mortality.survival(self.issue_age, t)
-                pv_val += cf * surv * curve.df(t)
-            return pv_val
-
-        if r is not None:
-            for t, cf in self.cashflows():
-                surv = self.mortality.survival(self.issue_age, t)
-                pv_val += cf * surv * discount_factor(t, r, self.compounding)
-            return pv_val
-
-        raise ValueError("Provide exactly one of r or curve")
+        amounts = self.payment * self._weights()
+        return _schedule_pv(amounts, self.n_payments, 1, 0, r, curve, self.compounding)
+
+
+@dataclass
+class JointLifeAnnuity(_TwoLifeAnnuity):
+    """Pays while both lives survive."""
+
+    def _payment_weight(self, grids: Dict[str, np.ndarray]) -> np.ndarray:
+        return grids["joint"]
+
+
+@dataclass
+class LastSurvivorAnnuity(_TwoLifeAnnuity):
+    """
+    Joint-and-survivor annuity: full payment while both live, survivor_fraction of it
+    while only one does (1.0 = pure last-survivor, e.g. 2/3 for a J&S 66.7% pension).
+    """
+
+    survivor_fraction: float = 1.0
+
+    def _payment_weight(self, grids: Dict[str, np.ndarray]) -> np.ndarray:
+        joint = grids["joint"]
+        return joint + self.survivor_fraction * (grids["last_survivor"] - joint)
+
+
+@dataclass
+class ReversionaryAnnuity(_TwoLifeAnnuity):
+    """Pays life 2 (the annuitant) after the death of life 1, for as long as life 2 lives."""
+
+    def _payment_weight(self, grids: Dict[str, np.ndarray]) -> np.ndarray:
+        return grids["life_2"] - grids["joint"]
+
+
+def two_life_pv_grid(
+    product: _TwoLifeAnnuity,
+    ages_1: Sequence[float],
+    ages_2: Sequence[float],
+    curve: ZeroCurve,
+) -> np.ndarray:
+    """
+    PV of `product` re-priced for every (issue_age_1, issue_age_2) pair on the grid,
+    shape (len(ages_1), len(ages_2)): one survival grid and one DF vector, no Python loop.
+    """
+    times = tuple(float(t) for t in range(1, product.n_payments + 1))
+    grids = two_life_survival_grids(product.mortality_1, product.mortality_2, ages_1, ages_2, times)
+    weights = np.broadcast_to(
+        product._payment_weight(grids), (len(ages_1), len(ages_2), len(times))
+    )
+    return product.payment * weights @ curve.df_vector(times)
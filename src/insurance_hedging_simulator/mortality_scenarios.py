@@ -0,0 +1,190 @@
+import math
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cashflows import aggregate_cashflows
+from .curve import ZeroCurve
+from .liabilities import GompertzMakeham
+from .stress import HedgeType, hedge_list
+
+
+@dataclass
+class StochasticGompertzMakeham:
+    """
+    Gompertz–Makeham with a Lee–Carter-style period index on the age-dependent term:
+        mu(x + t) = A + B * c^(x+t) * exp(k_t),   k_t = drift * t + volatility * W_t
+    A negative drift is mortality improvement; volatility makes longevity uncertain.
+    With drift = volatility = 0 it reproduces `base.survival` exactly.
+    """
+
+    base: GompertzMakeham = field(default_factory=GompertzMakeham)
+    drift: float = -0.01
+    volatility: float = 0.02
+
+    def survival_scenarios(
+        self,
+        issue_age: float,
+        times: Union[Sequence[float], np.ndarray],
+        n_scenarios: int,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """
+        Survival probabilities (n_scenarios x len(times)) for increasing times > 0.
+        k is simulated on the time grid and held constant within each interval, so the
+        Gompertz term integrates exactly over every step.
+        """
+        t = np.asarray(times, dtype=float)
+        if t.ndim != 1 or np.any(t <= 0) or np.any(np.diff(t) <= 0):
+            raise ValueError("times must be strictly increasing and > 0")
+        A, B, c = self.base.A, self.base.B, self.base.c
+        if c <= 0 or c == 1.0:
+            raise ValueError("c must be > 0 and != 1")
+        prev = np.concatenate([[0.0], t[:-1]])
+        dt = t - prev
+        gomp = (B / math.log(c)) * (c ** (issue_age + t) - c ** (issue_age + prev))
+
+        steps = self.drift * dt + self.volatility * np.sqrt(dt) * rng.standard_normal(
+            (n_scenarios, t.size)
+        )
+        # index applies from the start of each interval: k = 0 over the first one
+        k = np.concatenate([np.zeros((n_scenarios, 1)), np.cumsum(steps, axis=1)[:, :-1]], axis=1)
+        cum_hazard = np.cumsum(A * dt + gomp * np.exp(k), axis=1)
+        return np.exp(-cum_hazard)
+
+    def iter_survival_batches(
+        self,
+        issue_age: float,
+        times: Union[Sequence[float], np.ndarray],
+        n_scenarios: int,
+        batch_size: int,
+        rng: np.random.Generator,
+    ) -> Iterator[np.ndarray]:
+        """Generate `survival_scenarios` in batches of at most batch_size rows."""
+        for start in range(0, n_scenarios, batch_size):
+            yield self.survival_scenarios(
+                issue_age, times, min(batch_size, n_scenarios - start), rng
+            )
+
+
+def joint_pv_blocks(
+    times: np.ndarray,
+    amounts: np.ndarray,
+    curve: ZeroCurve,
+    shifts_bp: np.ndarray,
+    survival: np.ndarray,
+    rate_chunk: int = 1024,
+    mortality_chunk: int = 1024,
+) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    """
+    PV of unweighted cashflows under every (rate, mortality) pair, block by block:
+        PV[r, m] = sum_t amounts_t * DF_r(t) * S_m(t)  =  (DF * amounts) @ S.T
+    Yields (rate_slice, mortality_slice, block) with block of shape at most
+    (rate_chunk x mortality_chunk), so the full grid is never held in memory.
+    """
+    t = np.asarray(times, dtype=float)
+    shifts = np.asarray(shifts_bp, dtype=float)
+    weights = curve.interp_weights(t)
+    z_base = weights @ np.asarray(curve.zero_rates, dtype=float)
+    for r0 in range(0, shifts.shape[0], rate_chunk):
+        rs = slice(r0, min(r0 + rate_chunk, shifts.shape[0]))
+        z = z_base + (shifts[rs] / 10000.0) @ weights.T
+        discounted = np.exp(-z * t) * amounts  # (rate_chunk, T)
+        for m0 in range(0, survival.shape[0], mortality_chunk):
+            ms = slice(m0, min(m0 + mortality_chunk, survival.shape[0]))
+            yield rs, ms, discounted @ survival[ms].T
+
+
+@dataclass
+class JointScenarioSummary:
+    """Streaming statistics of net P&L over a (rate x mortality) scenario grid."""
+
+    n_scenarios: int
+    mean: float
+    std: float
+    var: float  # loss quantile at `confidence`, positive = loss
+    es: float
+    worst: float  # largest single loss
+    confidence: float
+    mean_by_rate: np.ndarray  # net P&L averaged over mortality, per rate scenario
+    mean_by_mortality: np.ndarray  # net P&L averaged over rates, per mortality scenario
+
+
+def run_joint_rate_mortality_scenarios(
+    liability,
+    base_curve: ZeroCurve,
+    sized_swap: HedgeType,
+    shifts_bp: np.ndarray,
+    mortality_model: StochasticGompertzMakeham,
+    n_mortality: int,
+    rng: np.random.Generator,
+    confidence: float = 0.995,
+    rate_chunk: int = 1024,
+    mortality_chunk: int = 1024,
+    survival: Optional[np.ndarray] = None,
+) -> JointScenarioSummary:
+    """
+    Net P&L of a single-life liability (anything with `cashflows()` and `issue_age`)
+    plus swap hedges under every combination of rate shift and mortality scenario.
+
+    Survival scenarios are generated once in batches (n_mortality x T is small); the
+    (n_rates x n_mortality) P&L grid is only ever materialized one block at a time and
+    reduced on the fly to moments, per-axis means and the loss tail needed for VaR/ES.
+    Pass `survival` to reuse a precomputed (n_mortality x T) matrix instead.
+    P&L is measured against `liability.pv`, so `mortality_model.base` must be the
+    liability's own mortality table; otherwise the grid would mix two tables.
+    """
+    if mortality_model.base != liability.mortality:
+        raise ValueError("mortality_model.base must match liability.mortality")
+    flows = liability.cashflows()
+    times = np.array([t for t, _ in flows], dtype=float)
+    amounts = np.array([cf for _, cf in flows], dtype=float)
+    if survival is None:
+        survival = np.vstack(
+            list(
+                mortality_model.iter_survival_batches(
+                    liability.issue_age, times, n_mortality, mortality_chunk, rng
+                )
+            )
+        )
+    shifts = np.asarray(shifts_bp, dtype=float)
+    n_r, n_m = shifts.shape[0], survival.shape[0]
+
+    base_pv = liability.pv(curve=base_curve)
+    swaps = hedge_list(sized_swap)
+    hedge_pnl = np.zeros(n_r)
+    if swaps:
+        hedge = aggregate_cashflows(swaps)
+        hedge_pnl = hedge.pv_under_shifts(base_curve, shifts) - hedge.pv(curve=base_curve)
+
+    n_total = n_r * n_m
+    k = max(1, math.ceil(round((1.0 - confidence) * n_total, 9)))
+    tail = np.empty(0)
+    total = total_sq = 0.0
+    by_rate = np.zeros(n_r)
+    by_mort = np.zeros(n_m)
+    for rs, ms, block in joint_pv_blocks(
+        times, amounts, base_curve, shifts, survival, rate_chunk, mortality_chunk
+    ):
+        net = block - base_pv + hedge_pnl[rs, None]
+        total += float(net.sum())
+        total_sq += float(np.square(net).sum())
+        by_rate[rs] += net.sum(axis=1)
+        by_mort[ms] += net.sum(axis=0)
+        losses = np.concatenate([tail, -net.ravel()])
+        tail = np.partition(losses, losses.size - k)[-k:] if losses.size > k else losses
+
+    mean = total / n_total
+    tail = np.sort(tail)
+    return JointScenarioSummary(
+        n_scenarios=n_total,
+        mean=mean,
+        std=math.sqrt(max(total_sq / n_total - mean * mean, 0.0)),
+        var=float(tail[0]),
+        es=float(tail.mean()),
+        worst=float(tail[-1]),
+        confidence=confidence,
+        mean_by_rate=by_rate / n_m,
+        mean_by_mortality=by_mort / n_r,
+    )
@@ -0,0 +1,210 @@
+from dataclasses import dataclass, field
+from itertools import combinations_with_replacement
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .cashflows import CashflowProfile, as_valuer
+from .curve import ZeroCurve
+from .horizon import horizon_zero_matrix, liability_slots, swap_slots
+from .stress import HedgeType, hedge_list
+
+COMPONENTS = ("liability", "hedge", "net")
+
+
+def _horizon_profile(times: np.ndarray, amounts: np.ndarray, horizon: float) -> CashflowProfile:
+    """Cashflows still alive at the horizon, re-timed to start from it."""
+    live = amounts != 0.0
+    tau = np.round(times[live] - horizon, 9)
+    grid, idx = np.unique(tau, return_inverse=True)
+    netted = np.zeros(grid.size)
+    np.add.at(netted, idx, amounts[live])
+    return CashflowProfile(times=grid, amounts=netted)
+
+
+def simulate_outer_states(
+    curve: ZeroCurve,
+    horizon: float,
+    n_outer: int,
+    cov_bp: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Real-world zero curves at the horizon (n_outer x n_pillars, decimal): the
+    forwards-realized curve plus Gaussian pillar moves with covariance cov_bp (bp^2).
+    """
+    mean = horizon_zero_matrix(curve, [horizon], mode="forwards")[0]
+    moves = rng.multivariate_normal(np.zeros(len(curve.pillars)), cov_bp, size=n_outer)
+    return mean + moves / 10000.0
+
+
+@dataclass
+class ProxyResult:
+    """LSMC proxy values over all outer scenarios and validation diagnostics."""
+
+    values: Dict[str, np.ndarray]  # component -> (n_outer,) horizon values
+    coefficients: Dict[str, np.ndarray]
+    fit_nodes: np.ndarray
+    validation_nodes: np.ndarray
+    diagnostics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+class NestedSimulation:
+    """
+    Value liability and swap hedges at a future horizon under each outer (real-world)
+    scenario.
+
+    Fixed cashflows (the rolled liability and the swap legs) are valued exactly on each
+    outer curve. A liability with scenario-dependent cashflows (only `pv_under_shifts`,
+    e.g. a `DeferredAnnuityBlock` describing the block as of the horizon) is valued as
+    given, as the mean over n_inner inner curves: the outer state plus Gaussian pillar
+    shocks with covariance inner_cov_bp (bp^2).
+
+    Exact nesting then costs n_outer x n_inner revaluations. `fit_proxy` values a sample
+    of outer nodes only, regresses the values on a polynomial in the leading principal
+    components of the pillar state and evaluates that proxy everywhere.
+    """
+
+    def __init__(
+        self,
+        liability,
+        base_curve: ZeroCurve,
+        sized_swap: HedgeType,
+        horizon: float,
+        inner_cov_bp: Optional[np.ndarray] = None,
+        n_inner: int = 200,
+        seed: int = 0,
+        chunk_size: int = 65536,
+    ):
+        self.base_curve = base_curve
+        self.horizon = float(horizon)
+        n_pillars = len(base_curve.pillars)
+        self.inner_cov_bp = (
+            np.zeros((n_pillars, n_pillars))
+            if inner_cov_bp is None
+            else np.asarray(inner_cov_bp, dtype=float)
+        )
+        self.n_inner = n_inner
+        self.chunk_size = chunk_size  # (outer x inner) curves valued per batch
+        self.rng = np.random.default_rng(seed)
+
+        h = np.array([self.horizon])
+        self._valuers: Dict[str, Any] = {}
+        valuer = as_valuer(liability)
+        if not isinstance(valuer, CashflowProfile):
+            if inner_cov_bp is None:
+                raise ValueError(
+                    "inner_cov_bp is required for a liability with scenario-dependent cashflows"
+                )
+            self._valuers["liability"] = valuer
+        else:
+            lt, la, _ = liability_slots(liability, h)
+            self._valuers["liability"] = _horizon_profile(lt[0], la[0], self.horizon)
+        swaps = hedge_list(sized_swap)
+        if swaps:
+            parts = [swap_slots(s, base_curve, h, "forwards") for s in swaps]
+            ht = np.concatenate([p[0][0] for p in parts])
+            ha = np.concatenate([p[1][0] for p in parts])
+            self._valuers["hedge"] = _horizon_profile(ht, ha, self.horizon)
+
+    def inner_values(self, outer_zeros: np.ndarray, n_inner: Optional[int] = None) -> Dict:
+        """
+        Nested values for the given outer states. Fixed-cashflow components are priced
+        exactly on each outer curve in one batched pv_under_shifts call. Components with
+        scenario-dependent cashflows average n_inner inner shocks per row; outer states
+        are processed in chunks of about `chunk_size` (outer x inner) curves, so memory
+        does not grow with n_outer.
+        """
+        n_inner = self.n_inner if n_inner is None else n_inner
+        states = np.atleast_2d(np.asarray(outer_zeros, dtype=float))
+        n_outer, n_pillars = states.shape
+        ref = self.base_curve
+        outer = (states - np.asarray(ref.zero_rates, dtype=float)) * 10000.0
+        out: Dict[str, np.ndarray] = {}
+        for name, valuer in self._valuers.items():
+            if isinstance(valuer, CashflowProfile):
+                out[name] = valuer.pv_under_shifts(ref, outer)
+                continue
+            out[name] = np.empty(n_outer)
+            step = max(1, self.chunk_size // max(n_inner, 1))
+            for start in range(0, n_outer, step):
+                block = outer[start : start + step]
+                inner = self.rng.multivariate_normal(
+                    np.zeros(n_pillars), self.inner_cov_bp, size=(block.shape[0], n_inner)
+                )
+                flat = (block[:, None, :] + inner).reshape(block.shape[0] * n_inner, n_pillars)
+                values = valuer.pv_under_shifts(ref, flat).reshape(block.shape[0], n_inner)
+                out[name][start : start + step] = values.mean(axis=1)
+        out.setdefault("hedge", np.zeros(n_outer))
+        out["net"] = out["liability"] + out["hedge"]
+        return out
+
+    def brute_force(self, outer_zeros: np.ndarray) -> Dict:
+        """Full nested simulation over every outer scenario (the reference answer)."""
+        return self.inner_values(outer_zeros)
+
+    @staticmethod
+    def _basis(factors: np.ndarray, degree: int) -> np.ndarray:
+        cols = [np.ones(factors.shape[0])]
+        for d in range(1, degree + 1):
+            for combo in combinations_with_replacement(range(factors.shape[1]), d):
+                cols.append(np.prod(factors[:, combo], axis=1))
+        return np.column_stack(cols)
+
+    def fit_proxy(
+        self,
+        outer_zeros: np.ndarray,
+        n_fit: int = 200,
+        n_inner_fit: int = 20,
+        n_validation: int = 20,
+        degree: int = 2,
+        n_factors: Optional[int] = None,
+    ) -> ProxyResult:
+        """
+        LSMC proxy: sample n_fit outer nodes, value each (scenario-dependent components
+        with a small inner set of n_inner_fit; the regression averages out the noise), fit
+        a degree-`degree` polynomial in the first n_factors PCA factors of the pillar state
+        (all of them by default; fewer keeps the basis small on long pillar sets) and
+        evaluate it over all outer scenarios. n_validation further nodes get full nested
+        values (self.n_inner) and are compared with the proxy.
+        """
+        states = np.asarray(outer_zeros, dtype=float)
+        n_outer = states.shape[0]
+        if n_fit + n_validation > n_outer:
+            raise ValueError("n_fit + n_validation exceeds the number of outer scenarios")
+
+        centred = (states - states.mean(axis=0)) * 10000.0
+        _, sv, vt = np.linalg.svd(centred, full_matrices=False)
+        k = vt.shape[0] if n_factors is None else min(n_factors, vt.shape[0])
+        scale = sv[:k] / np.sqrt(max(n_outer - 1, 1))
+        factors = centred @ vt[:k].T / np.where(scale > 0, scale, 1.0)
+        basis = self._basis(factors, degree)
+
+        nodes = self.rng.permutation(n_outer)
+        fit_nodes, val_nodes = nodes[:n_fit], nodes[n_fit : n_fit + n_validation]
+        targets = self.inner_values(states[fit_nodes], n_inner=n_inner_fit)
+        exact = self.inner_values(states[val_nodes]) if n_validation else None
+
+        values: Dict[str, np.ndarray] = {}
+        coefs: Dict[str, np.ndarray] = {}
+        diagnostics: Dict[str, Dict[str, float]] = {}
+        for name in COMPONENTS:
+            beta, *_ = np.linalg.lstsq(basis[fit_nodes], targets[name], rcond=None)
+            coefs[name] = beta
+            values[name] = basis @ beta
+            if exact is not None:
+                err = values[name][val_nodes] - exact[name]
+                spread = float(np.var(exact[name]))
+                diagnostics[name] = {
+                    "rmse": float(np.sqrt(np.mean(err**2))),
+                    "max_abs_error": float(np.max(np.abs(err))),
+                    "bias": float(np.mean(err)),
+                    "r_squared": 1.0 - float(np.mean(err**2)) / spread if spread else 0.0,
+                }
+        return ProxyResult(
+            values=values,
+            coefficients=coefs,
+            fit_nodes=fit_nodes,
+            validation_nodes=val_nodes,
+            diagnostics=diagnostics,
+        )
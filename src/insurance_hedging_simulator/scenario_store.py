@@ -0,0 +1,210 @@
+import json
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cashflows import aggregate_cashflows, as_valuer
+from .curve import ZeroCurve
+from .stress import HedgeType, hedge_list
+
+# File layout (little endian):
+#   8 bytes   magic b"IHSSCEN1"
+#   8 bytes   uint64 header length in bytes
+#   header    UTF-8 JSON (pillars, kind, units, n_scenarios, offsets, metadata), space padded
+#   values    float64 matrix (n_scenarios x n_pillars), C order, 64-byte aligned
+#   ids       optional fixed-width bytes (n_scenarios x id_width), 64-byte aligned
+MAGIC = b"IHSSCEN1"
+FORMAT_VERSION = 1
+_ALIGN = 64
+
+ScenarioKind = Literal["shift", "zero"]  # shift: pillar moves in bp; zero: zero rates (decimal)
+MapMode = Literal["r", "r+"]
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+@dataclass
+class ScenarioSet:
+    """
+    A memory-mapped scenario library: pillar axis x scenario-id axis x float64 values.
+    `values` is an np.memmap, so slicing it (e.g. via `chunks`) copies nothing.
+    """
+
+    path: str
+    pillars: List[float]
+    kind: ScenarioKind
+    values: np.memmap
+    ids: Optional[np.memmap] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def n_scenarios(self) -> int:
+        return int(self.values.shape[0])
+
+    @classmethod
+    def open(cls, path: str, mode: MapMode = "r") -> "ScenarioSet":
+        """Map an existing file; mode "r" (read-only) or "r+" (writable in place)."""
+        with open(path, "rb") as fh:
+            if fh.read(8) != MAGIC:
+                raise ValueError(f"{path} is not a scenario set file")
+            (hlen,) = struct.unpack("<Q", fh.read(8))
+            header = json.loads(fh.read(hlen).decode("utf-8"))
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported scenario set version {header['version']}")
+        n, p = header["n_scenarios"], len(header["pillars"])
+        values = np.memmap(path, dtype="<f8", mode=mode, offset=header["data_offset"], shape=(n, p))
+        ids = None
+        if header["id_width"]:
+            ids = np.memmap(
+                path,
+                dtype=f"S{header['id_width']}",
+                mode=mode,
+                offset=header["ids_offset"],
+                shape=(n,),
+            )
+        return cls(
+            path=path,
+            pillars=header["pillars"],
+            kind=header["kind"],
+            values=values,
+            ids=ids,
+            metadata=header["metadata"],
+        )
+
+    def scenario_ids(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Scenario names for rows [start, stop); row numbers if the file stores no ids."""
+        stop = self.n_scenarios if stop is None else min(stop, self.n_scenarios)
+        if self.ids is None:
+            return [str(i) for i in range(start, stop)]
+        return [b.decode("utf-8") for b in self.ids[start:stop]]
+
+    def chunks(self, size: int = 65536) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (start_row, values view) blocks without copying."""
+        for start in range(0, self.n_scenarios, size):
+            yield start, self.values[start : start + size]
+
+    def shifts_bp(self, base_curve: ZeroCurve, block: np.ndarray) -> np.ndarray:
+        """Pillar shifts (bp) for a block of rows relative to base_curve."""
+        if list(base_curve.pillars) != list(self.pillars):
+            raise ValueError("Scenario set pillars do not match the base curve")
+        if self.kind == "shift":
+            return block
+        return (block - np.asarray(base_curve.zero_rates, dtype=float)) * 10000.0
+
+    def shocks(
+        self, base_curve: ZeroCurve, start: int = 0, stop: Optional[int] = None
+    ) -> List[Tuple[str, ZeroCurve]]:
+        """Rows as (name, ZeroCurve) pairs for `run_stresses_on_liability_and_hedge`."""
+        stop = self.n_scenarios if stop is None else min(stop, self.n_scenarios)
+        shifts = self.shifts_bp(base_curve, self.values[start:stop])
+        base = np.asarray(base_curve.zero_rates, dtype=float)
+        return [
+            (name, ZeroCurve(base_curve.pillars[:], (base + s / 10000.0).tolist()))
+            for name, s in zip(self.scenario_ids(start, stop), shifts)
+        ]
+
+
+def create_scenario_set(
+    path: str,
+    pillars: Sequence[float],
+    n_scenarios: int,
+    kind: ScenarioKind = "shift",
+    id_width: int = 0,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> ScenarioSet:
+    """
+    Allocate a scenario file of the given shape and return it mapped "r+", so large
+    libraries can be filled block by block (`values[a:b] = ...`, `ids[a:b] = ...`).
+    id_width=0 stores no ids (rows are named by number).
+    """
+    if kind not in ("shift", "zero"):
+        raise ValueError("kind must be 'shift' or 'zero'")
+    p = len(pillars)
+    header = {
+        "version": FORMAT_VERSION,
+        "kind": kind,
+        "units": "bp" if kind == "shift" else "decimal",
+        "pillars": [float(t) for t in pillars],
+        "n_scenarios": int(n_scenarios),
+        "dtype": "<f8",
+        "id_width": int(id_width),
+        "metadata": metadata or {},
+        "data_offset": 0,
+        "ids_offset": 0,
+    }
+    # offsets depend on the header length, which depends on the offsets: reserve room
+    raw = json.dumps(header).encode("utf-8")
+    data_offset = _aligned(16 + len(raw) + 64)
+    ids_offset = _aligned(data_offset + 8 * n_scenarios * p)
+    header["data_offset"], header["ids_offset"] = data_offset, ids_offset
+    raw = json.dumps(header).encode("utf-8").ljust(data_offset - 16)
+    total = ids_offset + n_scenarios * id_width
+
+    with open(path, "wb") as fh:
+        fh.write(MAGIC + struct.pack("<Q", len(raw)) + raw)
+        fh.truncate(max(total, data_offset))
+    return ScenarioSet.open(path, mode="r+")
+
+
+def write_scenario_set(
+    path: str,
+    pillars: Sequence[float],
+    values: np.ndarray,
+    scenario_ids: Optional[Sequence[str]] = None,
+    kind: ScenarioKind = "shift",
+    metadata: Optional[Dict[str, Any]] = None,
+) -> ScenarioSet:
+    """Write a whole (n_scenarios x n_pillars) matrix in one go and return it read-only."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2 or values.shape[1] != len(pillars):
+        raise ValueError("values must have shape (n_scenarios, n_pillars)")
+    encoded = None
+    id_width = 0
+    if scenario_ids is not None:
+        if len(scenario_ids) != values.shape[0]:
+            raise ValueError("one scenario id per row is required")
+        encoded = [str(s).encode("utf-8") for s in scenario_ids]
+        id_width = max((len(b) for b in encoded), default=1) or 1
+    sset = create_scenario_set(path, pillars, values.shape[0], kind, id_width, metadata)
+    sset.values[:] = values
+    if encoded is not None and sset.ids is not None:
+        sset.ids[:] = encoded
+    sset.values.flush()
+    if sset.ids is not None:
+        sset.ids.flush()
+    return ScenarioSet.open(path)
+
+
+def stress_scenario_set(
+    liability_obj,
+    base_curve: ZeroCurve,
+    sized_swap: HedgeType,
+    scenarios: ScenarioSet,
+    chunk_size: int = 65536,
+) -> Dict[str, np.ndarray]:
+    """
+    Full-revaluation P&L for every scenario in a library, streamed chunk by chunk.
+    Liability and hedge are netted into cashflow profiles once; each memory-mapped block
+    then goes straight into one batched pv_under_shifts call per side. A liability with its
+    own `pv_under_shifts` (scenario-dependent cashflows, e.g. dynamic lapse) is used as is.
+    Returns {"liability_pnl", "hedge_pnl", "net_pnl"} arrays ordered like the file rows.
+    """
+    liab = as_valuer(liability_obj)
+    swaps = hedge_list(sized_swap)
+    hedge = aggregate_cashflows(swaps) if swaps else None
+    base_liab = liab.pv(curve=base_curve)
+    base_hedge = hedge.pv(curve=base_curve) if hedge is not None else 0.0
+
+    n = scenarios.n_scenarios
+    liab_pnl, hedge_pnl = np.empty(n), np.zeros(n)
+    for start, block in scenarios.chunks(chunk_size):
+        shifts = scenarios.shifts_bp(base_curve, block)
+        stop = start + block.shape[0]
+        liab_pnl[start:stop] = liab.pv_under_shifts(base_curve, shifts) - base_liab
+        if hedge is not None:
+            hedge_pnl[start:stop] = hedge.pv_under_shifts(base_curve, shifts) - base_hedge
+    return {"liability_pnl": liab_pnl, "hedge_pnl": hedge_pnl, "net_pnl": liab_pnl + hedge_pnl}
@@ -0,0 +1,382 @@
+"""
+Local risk service: keeps curves, liabilities, swap books and their cashflow/DF caches warm
+in one process and serves PV, DV01, KR01, hedge sizing and stresses as JSON over HTTP/1.1
+(TCP or Unix socket). Standard library + numpy only.
+
+    python -m insurance_hedging_simulator.service --port 8765
+    python -m insurance_hedging_simulator.service --unix /tmp/ihs.sock
+
+All endpoints take and return JSON via POST (GET /health for liveness):
+    /curves       {"name", "pillars", "zero_rates"}
+    /liabilities  {"name", "type": "AnnuityCertain" | ..., **fields}
+    /books        {"name", "swaps": [{SizedSwap fields}, ...]}
+    /pv, /dv01, /kr01   {"curve", "position"}        position = liability or book name
+    /size_hedge   {"curve", "liability", "maturity_years", "payments_per_year"?, "book"?}
+    /stress       {"curve", "liability", "book"?, "shocks": [{"name", "parallel_bp"} |
+                   {"name", "key_index", "bp"} | {"name", "shifts_bp": [...]}]}
+
+PV/DV01/KR01 requests that arrive against the same curve within `batch_window` seconds are
+coalesced: the positions are netted onto one union date grid and priced with a single
+discount vector and interpolation-weight matrix. Sensitivities are the analytic
+linear-interpolation derivatives (see curve_risk.analytic_keyrate_dv01s).
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cashflows import CashflowBook
+from .curve import ZeroCurve
+from .hedge_swap import SizedSwap, size_dv01_hedge_payer_fixed
+from .liabilities import (
+    AnnuityCertain,
+    DeferredAnnuityCertain,
+    GompertzMakeham,
+    JointLifeAnnuity,
+    LastSurvivorAnnuity,
+    LifeAnnuityImmediate,
+    ReversionaryAnnuity,
+)
+
+LIABILITY_TYPES = {
+    "AnnuityCertain": AnnuityCertain,
+    "DeferredAnnuityCertain": DeferredAnnuityCertain,
+    "LifeAnnuityImmediate": LifeAnnuityImmediate,
+    "JointLifeAnnuity": JointLifeAnnuity,
+    "LastSurvivorAnnuity": LastSurvivorAnnuity,
+    "ReversionaryAnnuity": ReversionaryAnnuity,
+}
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+_MAX_BATCH_CACHE = 64
+
+
+def build_liability(spec: Dict[str, Any]):
+    """Construct a liability from its JSON spec ({"type": ..., **dataclass fields})."""
+    fields = dict(spec)
+    kind = fields.pop("type", None)
+    if kind not in LIABILITY_TYPES:
+        raise ValueError(f"Unknown liability type: {kind!r}")
+    for key in ("mortality", "mortality_1", "mortality_2"):
+        if isinstance(fields.get(key), dict):
+            fields[key] = GompertzMakeham(**fields[key])
+    return LIABILITY_TYPES[kind](**fields)
+
+
+def _swap_to_dict(s: SizedSwap) -> Dict[str, Any]:
+    return {
+        "maturity_years": s.maturity_years,
+        "payments_per_year": s.payments_per_year,
+        "pay_fixed": s.pay_fixed,
+        "notional": s.notional,
+        "fixed_rate": s.fixed_rate,
+    }
+
+
+class RiskService:
+    """In-memory state plus request handlers; transport lives in `serve`."""
+
+    def __init__(self, batch_window: float = 0.002):
+        self.batch_window = batch_window
+        self.curves: Dict[str, ZeroCurve] = {}
+        self.liabilities: Dict[str, Any] = {}
+        self.books: Dict[str, List[SizedSwap]] = {}
+        self.stats = {"requests": 0, "batches": 0}
+        self._curve_versions: Dict[str, int] = {}
+        self._positions: Dict[str, CashflowBook] = {}
+        self._batch_cache: Dict[Tuple, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._routes = {
+            "/curves": self._put_curve,
+            "/liabilities": self._put_liability,
+            "/books": self._put_book,
+            "/pv": self._pv,
+            "/dv01": self._dv01,
+            "/kr01": self._kr01,
+            "/size_hedge": self._size_hedge,
+            "/stress": self._stress,
+        }
+
+    # ---- lookups -------------------------------------------------------------------------
+
+    def _curve(self, name: str) -> ZeroCurve:
+        if name not in self.curves:
+            raise KeyError(f"Unknown curve: {name!r}")
+        return self.curves[name]
+
+    def _position(self, name: str) -> CashflowBook:
+        if name not in self._positions:
+            raise KeyError(f"Unknown position: {name!r}")
+        return self._positions[name]
+
+    # ---- state endpoints -----------------------------------------------------------------
+
+    async def _put_curve(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        curve = ZeroCurve(list(map(float, req["pillars"])), list(map(float, req["zero_rates"])))
+        if len(curve.pillars) != len(curve.zero_rates):
+            raise ValueError("pillars and zero_rates must have the same length")
+        self.curves[req["name"]] = curve
+        self._curve_versions[req["name"]] = self._curve_versions.get(req["name"], 0) + 1
+        return {"name": req["name"], "version": self._curve_versions[req["name"]]}
+
+    async def _put_liability(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        spec = dict(req)
+        name = spec.pop("name")
+        liab = build_liability(spec)
+        self.liabilities[name] = liab
+        self._positions[name] = CashflowBook([liab])
+        return {"name": name}
+
+    async def _put_book(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        swaps = [SizedSwap(**s) for s in req["swaps"]]
+        self.books[req["name"]] = swaps
+        self._positions[req["name"]] = CashflowBook(swaps)
+        return {"name": req["name"], "n_swaps": len(swaps)}
+
+    # ---- batched risk --------------------------------------------------------------------
+
+    def _batch_arrays(self, curve_name: str, names: List[str]):
+        """Union grid, amounts matrix, DF vector and t*DF*W for a set of positions (cached)."""
+        books = [self._positions[n] for n in names]
+        key = (curve_name, self._curve_versions[curve_name]) + tuple(
+            (n, b.fingerprint()) for n, b in zip(names, books)
+        )
+        if key not in self._batch_cache:
+            curve = self.curves[curve_name]
+            profiles = [b.profile() for b in books]
+            grid = np.unique(np.concatenate([p.times for p in profiles]))
+            amounts = np.zeros((len(profiles), grid.size))
+            for i, p in enumerate(profiles):
+                amounts[i, np.searchsorted(grid, p.times)] = p.amounts
+            df = curve.df_vector(grid)
+            sens = (grid * df)[:, None] * curve.interp_weights(grid) * 1e-4
+            if len(self._batch_cache) >= _MAX_BATCH_CACHE:
+                self._batch_cache.clear()
+            self._batch_cache[key] = (grid, amounts, df, sens)
+        return self._batch_cache[key]
+
+    def _flush(self, curve_name: str) -> None:
+        batch = self._pending.pop(curve_name, [])
+        if not batch:
+            return
+        self.stats["batches"] += 1
+        try:
+            names = sorted({name for name, _ in batch})
+            _, amounts, df, sens = self._batch_arrays(curve_name, names)
+            pv = amounts @ df
+            kr01 = amounts @ sens
+            results = {n: (float(pv[i]), kr01[i]) for i, n in enumerate(names)}
+            for name, fut in batch:
+                if not fut.done():
+                    fut.set_result(results[name])
+        except Exception as exc:  # surface to every waiter rather than hanging them
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+
+    async def _risk(self, curve_name: str, position: str) -> Tuple[float, np.ndarray]:
+        self._curve(curve_name)
+        self._position(position)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        pending = self._pending.setdefault(curve_name, [])
+        pending.append((position, fut))
+        if len(pending) == 1:
+            loop.call_later(self.batch_window, self._flush, curve_name)
+        return await fut
+
+    async def _pv(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        pv, _ = await self._risk(req["curve"], req["position"])
+        return {"pv": pv}
+
+    async def _dv01(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        _, kr01 = await self._risk(req["curve"], req["position"])
+        return {"dv01": float(kr01.sum())}
+
+    async def _kr01(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        _, kr01 = await self._risk(req["curve"], req["position"])
+        pillars = self.curves[req["curve"]].pillars
+        return {"kr01": {str(t): float(v) for t, v in zip(pillars, kr01)}}
+
+    # ---- hedging and stresses ------------------------------------------------------------
+
+    async def _size_hedge(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        curve = self._curve(req["curve"])
+        _, kr01 = await self._risk(req["curve"], req["liability"])
+        swap = size_dv01_hedge_payer_fixed(
+            float(kr01.sum()),
+            curve,
+            maturity_years=int(req.get("maturity_years", 10)),
+            payments_per_year=int(req.get("payments_per_year", 1)),
+        )
+        if "book" in req:
+            swaps = self.books.get(req["book"], []) + [swap]
+            await self._put_book({"name": req["book"], "swaps": list(map(_swap_to_dict, swaps))})
+        return {"swap": _swap_to_dict(swap)}
+
+    async def _stress(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        curve = self._curve(req["curve"])
+        n = len(curve.pillars)
+        names, shifts = [], np.zeros((len(req["shocks"]), n))
+        for i, shock in enumerate(req["shocks"]):
+            names.append(shock["name"])
+            if "parallel_bp" in shock:
+                shifts[i, :] = shock["parallel_bp"]
+            elif "key_index" in shock:
+                k = int(shock["key_index"])
+                if not 0 <= k < n:
+                    raise ValueError(f"key_index {k} out of range for a {n}-pillar curve")
+                shifts[i, k] = shock["bp"]
+            else:
+                row = np.asarray(shock["shifts_bp"], dtype=float)
+                if row.shape != (n,):
+                    raise ValueError(f"shifts_bp must have one value per pillar ({n})")
+                shifts[i, :] = row
+        liab = self._position(req["liability"]).profile()
+        liab_pnl = liab.pv_under_shifts(curve, shifts) - liab.pv(curve=curve)
+        hedge_pnl = np.zeros(len(names))
+        if req.get("book"):
+            hedge = self._position(req["book"]).profile()
+            hedge_pnl = hedge.pv_under_shifts(curve, shifts) - hedge.pv(curve=curve)
+        rows = [
+            {
+                "shock": name,
+                "liability_pnl": float(lp),
+                "hedge_pnl": float(hp),
+                "net_pnl": float(lp + hp),
+            }
+            for name, lp, hp in zip(names, liab_pnl, hedge_pnl)
+        ]
+        return {"rows": rows}
+
+    # ---- dispatch ------------------------------------------------------------------------
+
+    async def handle(self, method: str, path: str, payload: Optional[Dict[str, Any]]):
+        """Route one request; returns (status, JSON-able dict). Usable without a socket."""
+        self.stats["requests"] += 1
+        if path == "/health":
+            return 200, {"status": "ok", **self.stats}
+        if path not in self._routes:
+            return 404, {"error": f"Unknown endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            return 200, await self._routes[path](payload or {})
+        except (KeyError, ValueError, TypeError) as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:  # a request always gets a reply, never a dropped socket
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Minimal HTTP/1.1 with keep-alive: one JSON body in, one JSON body out."""
+        try:
+            while True:
+                headers: Dict[str, str] = {}
+                try:
+                    # readline raises ValueError once a line outgrows the stream limit
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    request_line = line.decode("latin-1").split(" ", 2)
+                    while True:
+                        h = await reader.readline()
+                        if h in (b"\r\n", b"\n", b""):
+                            break
+                        k, _, v = h.decode("latin-1").partition(":")
+                        headers[k.strip().lower()] = v.strip()
+                    if len(request_line) != 3:
+                        raise ValueError(f"Malformed request line: {line!r}")
+                    method, path, _ = request_line
+                    body = await reader.readexactly(int(headers.get("content-length", 0)))
+                    payload = json.loads(body) if body else None
+                    status, result = await self.handle(method, path, payload)
+                except json.JSONDecodeError as exc:
+                    status, result = 400, {"error": f"Invalid JSON: {exc}"}
+                except (ValueError, asyncio.LimitOverrunError) as exc:  # framing or Content-Length
+                    status, result = 400, {"error": str(exc)}
+                    headers["connection"] = "close"  # cannot trust the framing any more
+                data = json.dumps(result).encode()
+                keep = headers.get("connection", "").lower() != "close"
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode() + data)
+                await writer.drain()
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    service: RiskService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+) -> asyncio.AbstractServer:
+    """Start listening (TCP or Unix socket) and return the running server."""
+    if unix_path is not None:
+        return await asyncio.start_unix_server(service._handle_connection, path=unix_path)
+    return await asyncio.start_server(service._handle_connection, host=host, port=port)
+
+
+async def call(
+    path: str,
+    payload: Optional[Dict[str, Any]] = None,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+) -> Tuple[int, Dict[str, Any]]:
+    """Tiny one-shot client: POST JSON (GET if payload is None) and return (status, body)."""
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    method = "GET" if payload is None else "POST"
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: local\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(data)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local insurance hedging risk service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="serve on this Unix socket path instead")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    async def _run() -> None:
+        service = RiskService(batch_window=args.batch_window_ms / 1000.0)
+        server = await serve(service, args.host, args.port, args.unix)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
-from typing import Dict, List, Tuple, Union
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 from .curve import ZeroCurve
-from .hedge_swap import SizedSwap, swap_pv_payer_fixed
+from .curve_risk import keyrate_dv01s_and_cross_gamma
+from .hedge_swap import SizedSwap
 
 # A hedge can be nothing, one swap, or a portfolio of swaps
 HedgeType = Union[None, SizedSwap, List[SizedSwap]]
 
 
+def hedge_list(hedge: HedgeType) -> List[SizedSwap]:
+    """The swaps of a hedge given as None, one swap, or a list of swaps."""
+    if hedge is None:
+        return []
+    return hedge if isinstance(hedge, list) else [hedge]
+
+
 def shock_parallel_bp(curve: ZeroCurve, bp: float) -> ZeroCurve:
     """Return a curve bumped in parallel by bp basis points."""
     dr = bp / 10000.0
@@ -19,23 +31,26 @@ def shock_keyrate_bp(curve: ZeroCurve, key_index: int, bp: float) -> ZeroCurve:
     return curve.bumped_key_index(key_index, dr)
 
 
-def _pv_swap_any(curve: ZeroCurve, hedge: HedgeType) -> float:
-    """Compute PV for a hedge that may be None, a single swap, or a list of swaps."""
-    if hedge is None:
-        return 0.0
-    if isinstance(hedge, list):
-        total = 0.0
-        for h in hedge:
-            pv = swap_pv_payer_fixed(
-                curve, h.notional, h.maturity_years, h.payments_per_year, h.fixed_rate
-            )
-            total += pv if h.pay_fixed else -pv
-        return total
-    # single SizedSwap
-    pv = swap_pv_payer_fixed(
-        curve, hedge.notional, hedge.maturity_years, hedge.payments_per_year, hedge.fixed_rate
-    )
-    return pv if hedge.pay_fixed else -pv
+def _pv_swap_any(
+    curve: ZeroCurve, hedge: HedgeType, projection_curve: Optional[ZeroCurve] = None
+) -> float:
+    """
+    Compute PV for a hedge that may be None, a single swap, or a list of swaps.
+    With a projection curve the swaps are priced dual-curve (`curve` discounts).
+    """
+    return sum(h.pv(curve, projection_curve=projection_curve) for h in hedge_list(hedge))
+
+
+def shift_projection_curve(
+    base_curve: ZeroCurve, shocked_curve: ZeroCurve, projection_curve: ZeroCurve
+) -> ZeroCurve:
+    """
+    Apply the move base_curve -> shocked_curve to a projection curve, tenor by tenor at the
+    projection curve's own pillars, so the basis spread between the two curves is held.
+    """
+    p = projection_curve.pillars
+    move = shocked_curve.zeros_vector(p) - base_curve.zeros_vector(p)
+    return ZeroCurve(p[:], (np.asarray(projection_curve.zero_rates) + move).tolist())
 
 
 def run_stresses_on_liability_and_hedge(
@@ -43,18 +58,26 @@ def run_stresses_on_liability_and_hedge(
     base_curve: ZeroCurve,
     sized_swap: HedgeType,  # None | SizedSwap | List[SizedSwap]
     shocks: List[Tuple[str, ZeroCurve]],
+    projection_curve: Optional[ZeroCurve] = None,
 ) -> List[Dict]:
     """
     Compute P&L under a list of curve shocks.
     Returns rows with shock name, liability P&L, hedge P&L, and net P&L.
+    With a projection curve the hedge is priced dual-curve: shocks are discount-curve
+    moves, and each is carried over to the projection curve by `shift_projection_curve`.
     """
     rows = []
     pv_liab_base = liability_obj.pv(curve=base_curve)
-    pv_hedge_base = _pv_swap_any(base_curve, sized_swap)
+    pv_hedge_base = _pv_swap_any(base_curve, sized_swap, projection_curve)
 
     for name, shocked in shocks:
+        proj = (
+            None
+            if projection_curve is None
+            else shift_projection_curve(base_curve, shocked, projection_curve)
+        )
         pv_liab_sh = liability_obj.pv(curve=shocked)
-        pv_hedge_sh = _pv_swap_any(shocked, sized_swap)
+        pv_hedge_sh = _pv_swap_any(shocked, sized_swap, proj)
         pnl_liab = pv_liab_sh - pv_liab_base
         pnl_hedge = pv_hedge_sh - pv_hedge_base
         rows.append(
@@ -66,3 +89,130 @@ def run_stresses_on_liability_and_hedge(
             }
         )
     return rows
+
+
+def shock_matrix_from_curves(
+    base_curve: ZeroCurve, shocks: List[Tuple[str, ZeroCurve]]
+) -> Tuple[List[str], np.ndarray]:
+    """Turn named shocked curves into (names, pillar shifts in bp of shape (n, n_pillars))."""
+    base = np.asarray(base_curve.zero_rates, dtype=float)
+    for _, c in shocks:
+        if list(c.pillars) != list(base_curve.pillars):
+            raise ValueError("Shocked curve pillars must match the base curve")
+    names = [name for name, _ in shocks]
+    shifts = np.array([np.asarray(c.zero_rates, dtype=float) - base for _, c in shocks]) * 10000.0
+    return names, shifts.reshape(len(shocks), len(base_curve.pillars))
+
+
+def curve_from_shift(base_curve: ZeroCurve, shift_bp: np.ndarray) -> ZeroCurve:
+    """Base curve with a per-pillar shift vector (bp) applied."""
+    return ZeroCurve(
+        base_curve.pillars[:], [z + s / 10000.0 for z, s in zip(base_curve.zero_rates, shift_bp)]
+    )
+
+
+class _HedgePV:
+    """
+    Adapter so a HedgeType can be fed to the curve_risk helpers, including
+    `keyrate_dv01s_dual` for KR01 ladders of a dual-curve hedge book.
+    """
+
+    def __init__(self, hedge: HedgeType):
+        self.hedge = hedge
+
+    def pv(self, curve: ZeroCurve, projection_curve: Optional[ZeroCurve] = None) -> float:
+        return _pv_swap_any(curve, self.hedge, projection_curve)
+
+
+@dataclass
+class FastStressResult:
+    """Per-scenario P&L arrays from `run_fast_stresses` plus approximation diagnostics."""
+
+    liability_pnl: np.ndarray
+    hedge_pnl: np.ndarray
+    net_pnl: np.ndarray
+    full_reval: np.ndarray  # bool mask: True where the scenario was fully repriced
+    accuracy: Dict[str, float] = field(default_factory=dict)
+
+
+def run_fast_stresses(
+    liability_obj,
+    base_curve: ZeroCurve,
+    sized_swap: HedgeType,
+    shifts_bp: np.ndarray,
+    use_gamma: bool = True,
+    tail_fraction: float = 0.01,
+    error_tol: Optional[float] = None,
+    bp: float = 1.0,
+) -> FastStressResult:
+    """
+    Sensitivity-based P&L for many pillar-shift scenarios (shifts_bp: n_scenarios x n_pillars).
+
+    P&L ~ -S @ KR01 (+ 0.5 * s' G s with the cross-gamma G) for liability and hedge, using
+    one set of bumped reprices for the sensitivities. Afterwards the worst `tail_fraction`
+    of scenarios by approximate net P&L, plus any whose estimated approximation error
+    exceeds `error_tol` (currency), are fully repriced and overwrite the estimate.
+
+    The error estimate is the magnitude of the first omitted Taylor term: the gamma term
+    for delta-only runs; for delta-gamma runs, the gamma term scaled by its ratio to the
+    delta term (the t * dz scale that governs the next order), per component.
+    The `accuracy` dict compares approximate vs full net P&L over the repriced subset.
+    """
+    S = np.asarray(shifts_bp, dtype=float)
+    n_pillars = len(base_curve.pillars)
+    if S.ndim != 2 or S.shape[1] != n_pillars:
+        raise ValueError("shifts_bp must have shape (n_scenarios, n_pillars)")
+    keys = list(range(n_pillars))
+    hedge_obj = _HedgePV(sized_swap)
+
+    kr_l, g_l = keyrate_dv01s_and_cross_gamma(liability_obj, base_curve, keys, bp)
+    kr_h, g_h = keyrate_dv01s_and_cross_gamma(hedge_obj, base_curve, keys, bp)
+    kr01 = np.column_stack([list(kr_l.values()), list(kr_h.values())])  # (n_pillars, 2)
+
+    delta = -S @ kr01  # (n, 2): liability, hedge
+    gamma = np.column_stack(
+        [0.5 * np.einsum("ij,jk,ik->i", S, g, S, optimize=True) for g in (g_l, g_h)]
+    )
+    pnl = delta + gamma if use_gamma else delta.copy()
+
+    if use_gamma:
+        ratio = np.abs(gamma) / np.maximum(np.abs(delta), 1e-300)
+        err_est = np.sum(np.abs(gamma) * (2.0 / 3.0) * ratio, axis=1)
+    else:
+        err_est = np.sum(np.abs(gamma), axis=1)
+
+    net = pnl.sum(axis=1)
+    mask = np.zeros(S.shape[0], dtype=bool)
+    n_tail = int(math.ceil(tail_fraction * S.shape[0])) if tail_fraction > 0 else 0
+    if n_tail:
+        mask[np.argsort(net)[:n_tail]] = True
+    if error_tol is not None:
+        mask |= err_est > error_tol
+
+    approx_net = net[mask].copy()
+    pv_liab_base = liability_obj.pv(curve=base_curve)
+    pv_hedge_base = _pv_swap_any(base_curve, sized_swap)
+    for i in np.flatnonzero(mask):
+        shocked = curve_from_shift(base_curve, S[i])
+        pnl[i, 0] = liability_obj.pv(curve=shocked) - pv_liab_base
+        pnl[i, 1] = _pv_swap_any(shocked, sized_swap) - pv_hedge_base
+    net = pnl.sum(axis=1)
+
+    accuracy: Dict[str, float] = {"n_full_reval": float(mask.sum())}
+    if mask.any():
+        err = approx_net - net[mask]
+        rms_full = float(np.sqrt(np.mean(net[mask] ** 2)))
+        accuracy.update(
+            {
+                "max_abs_error": float(np.max(np.abs(err))),
+                "rmse": float(np.sqrt(np.mean(err**2))),
+                "rel_rmse": float(np.sqrt(np.mean(err**2)) / rms_full) if rms_full else 0.0,
+            }
+        )
+    return FastStressResult(
+        liability_pnl=pnl[:, 0],
+        hedge_pnl=pnl[:, 1],
+        net_pnl=net,
+        full_reval=mask,
+        accuracy=accuracy,
+    )
@@ -0,0 +1,11 @@
+import pytest
+
+from insurance_hedging_simulator.curve import ZeroCurve
+
+
+@pytest.fixture
+def curve():
+    """Upward-sloping zero curve shared by the portfolio and scenario tests."""
+    pillars = [0.5, 1, 2, 5, 10, 20]
+    zeros = [0.030, 0.031, 0.033, 0.036, 0.038, 0.039]
+    return ZeroCurve(pillars, zeros)
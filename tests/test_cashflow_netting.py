@@ -0,0 +1,63 @@
+import numpy as np
+
+from insurance_hedging_simulator import AnnuityCertain, LifeAnnuityImmediate
+from insurance_hedging_simulator.cashflows import CashflowBook, aggregate_cashflows
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import keyrate_dv01s
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.stress import _pv_swap_any
+
+
+def test_netted_profile_matches_position_by_position_pv_and_kr01(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    life = LifeAnnuityImmediate(payment=50.0, n_payments=25, issue_age=65)
+    s10 = size_dv01_hedge_payer_fixed(0.5, curve, maturity_years=10, payments_per_year=2)
+    s20 = size_dv01_hedge_payer_fixed(0.8, curve, maturity_years=20, payments_per_year=1)
+
+    profile = aggregate_cashflows([liab, life, s10, s20])
+    # annual and semi-annual dates share one grid
+    assert len(profile.times) == len(set(profile.times.tolist()))
+
+    expected = liab.pv(curve=curve) + life.pv(curve=curve) + _pv_swap_any(curve, [s10, s20])
+    assert abs(profile.pv(curve=curve) - expected) < 1e-9
+
+    kr_book = keyrate_dv01s(profile, curve, [3, 4, 5])
+    kr_liab = keyrate_dv01s(liab, curve, [3, 4, 5])
+    kr_life = keyrate_dv01s(life, curve, [3, 4, 5])
+    kr_s10 = keyrate_dv01s(s10, curve, [3, 4, 5])
+    kr_s20 = keyrate_dv01s(s20, curve, [3, 4, 5])
+    for t in kr_book:
+        assert abs(kr_book[t] - (kr_liab[t] + kr_life[t] + kr_s10[t] + kr_s20[t])) < 1e-9
+
+
+def test_pv_under_shifts_matches_bumped_curves(curve):
+    profile = aggregate_cashflows([AnnuityCertain(payment=100.0, n_payments=20)])
+    shifts = np.array([[0, 0, 0, 0, 0, 0], [100] * 6, [0, 0, 0, 25, 0, -10]], dtype=float)
+    pvs = profile.pv_under_shifts(curve, shifts, chunk_size=2)
+    for row, pv in zip(shifts, pvs):
+        shocked = ZeroCurve(curve.pillars, [z + s / 1e4 for z, s in zip(curve.zero_rates, row)])
+        assert abs(pv - profile.pv(curve=shocked)) < 1e-9
+
+
+def test_book_profile_is_reused_until_positions_change(curve, tmp_path):
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10)
+    book = CashflowBook([AnnuityCertain(payment=100.0, n_payments=20), swap])
+    first = book.profile()
+    assert book.profile() is first
+
+    path = str(tmp_path / "book.npz")
+    book.save_profile(path)
+    other = CashflowBook(list(book.positions))
+    assert other.load_profile(path)
+    assert abs(other.pv(curve=curve) - book.pv(curve=curve)) < 1e-12
+
+    swap.notional *= 2.0  # resizing the hedge invalidates the cached profile
+    assert book.profile() is not first
+    assert not other.load_profile(path)
+
+
+def test_profile_flat_rate_is_continuous_compounding():
+    ann = AnnuityCertain(payment=100.0, n_payments=5, compounding="annual")
+    prof = aggregate_cashflows([ann])
+    assert abs(prof.pv(r=0.04) - AnnuityCertain(100.0, 5).pv(r=0.04)) < 1e-9
+    assert abs(prof.pv(r=0.04) - ann.pv(r=0.04)) > 1e-3
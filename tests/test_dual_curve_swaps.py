@@ -0,0 +1,91 @@
+import numpy as np
+
+from insurance_hedging_simulator.cashflows import CashflowProfile, swap_cashflows
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import keyrate_dv01s, keyrate_dv01s_dual
+from insurance_hedging_simulator.hedge_swap import (
+    SizedSwap,
+    _schedule_grid,
+    par_swap_rate,
+    schedule_dfs,
+    size_dv01_hedge_payer_fixed,
+    swap_pv_payer_fixed,
+)
+from insurance_hedging_simulator.liabilities import AnnuityCertain
+from insurance_hedging_simulator.stress import (
+    _HedgePV,
+    run_stresses_on_liability_and_hedge,
+    shift_projection_curve,
+    shock_parallel_bp,
+)
+
+PILLARS = [0.5, 1, 2, 5, 10, 20]
+OIS = ZeroCurve(PILLARS, [0.028, 0.029, 0.031, 0.034, 0.036, 0.037])
+
+
+def test_dual_curve_collapses_to_single_curve_when_curves_coincide():
+    for ppy in (1, 2, 4):
+        k_single = par_swap_rate(OIS, 10, ppy)
+        k_dual = par_swap_rate(OIS, 10, ppy, projection_curve=OIS)
+        assert abs(k_single - k_dual) < 1e-12
+        pv_single = swap_pv_payer_fixed(OIS, 1e6, 10, ppy, 0.03)
+        pv_dual = swap_pv_payer_fixed(OIS, 1e6, 10, ppy, 0.03, projection_curve=OIS)
+        assert abs(pv_single - pv_dual) < 1e-6
+
+    swap = SizedSwap(10, 2, True, 1e6, 0.03)
+    kr = keyrate_dv01s_dual(swap, OIS, OIS)
+    single = keyrate_dv01s(swap, OIS, list(range(6)))
+    for t in PILLARS:
+        assert abs(kr["discount"][t] + kr["projection"][t] - single[t]) < 1e-3
+
+
+def test_projection_spread_raises_par_rate_and_splits_risk_by_curve():
+    libor = ZeroCurve(PILLARS[:-1] + [30.0], [z + 0.002 for z in OIS.zero_rates])
+    swap = size_dv01_hedge_payer_fixed(1.0, OIS, maturity_years=10, projection_curve=libor)
+    assert swap.fixed_rate > par_swap_rate(OIS, 10)
+    assert abs(swap.pv(OIS, projection_curve=libor)) < 1e-9  # at par on the dual curves
+
+    kr = keyrate_dv01s_dual(swap, OIS, libor)
+    assert set(kr["projection"]) == {0.5, 1, 2, 5, 10, 30.0}  # projection curve's own pillars
+    assert sum(kr["projection"].values()) < 0  # payer: gains when projected rates rise
+    assert abs(sum(kr["discount"].values())) < abs(sum(kr["projection"].values()))
+
+    # projected float coupons discounted on OIS reproduce the dual-curve PV
+    flows = swap_cashflows(swap, projection_curve=libor)
+    prof = CashflowProfile(np.array([t for t, _ in flows]), np.array([a for _, a in flows]))
+    assert abs(prof.pv(curve=OIS) - swap.pv(OIS, projection_curve=libor)) < 1e-9
+
+    # DF grids are cached per (schedule, curve)
+    assert schedule_dfs(OIS, 10, 1) is schedule_dfs(OIS, 10, 1)
+
+
+def test_stress_runner_and_hedge_book_price_dual_curve():
+    libor = ZeroCurve(PILLARS, [z + 0.0025 for z in OIS.zero_rates])
+    swaps = [
+        size_dv01_hedge_payer_fixed(0.5, OIS, maturity_years=10, projection_curve=libor),
+        size_dv01_hedge_payer_fixed(0.3, OIS, maturity_years=20, projection_curve=libor),
+    ]
+    liab = AnnuityCertain(payment=100.0, n_payments=25)
+    up = shock_parallel_bp(OIS, 50)
+    row = run_stresses_on_liability_and_hedge(
+        liab, OIS, swaps, [("up", up)], projection_curve=libor
+    )[0]
+    libor_up = shift_projection_curve(OIS, up, libor)
+    assert np.allclose(libor_up.zero_rates, [z + 0.005 for z in libor.zero_rates])
+    expected = sum(
+        s.pv(up, projection_curve=libor_up) - s.pv(OIS, projection_curve=libor) for s in swaps
+    )
+    assert abs(row["hedge_pnl"] - expected) < 1e-9
+    single = run_stresses_on_liability_and_hedge(liab, OIS, swaps, [("up", up)])[0]
+    assert abs(row["hedge_pnl"] - single["hedge_pnl"]) > 1e-6  # basis matters
+
+    # KR01 ladders of the whole hedge book, per curve
+    kr = keyrate_dv01s_dual(_HedgePV(swaps), OIS, libor)
+    for t in PILLARS:
+        parts = [keyrate_dv01s_dual(s, OIS, libor) for s in swaps]
+        assert abs(kr["projection"][t] - sum(p["projection"][t] for p in parts)) < 1e-9
+
+    # bumped curves reuse the rates-free schedule grid
+    before = _schedule_grid.cache_info().hits
+    par_swap_rate(OIS.bumped_key_index(2, 3.7e-4), 10)  # new rates: DF-cache miss
+    assert _schedule_grid.cache_info().hits > before
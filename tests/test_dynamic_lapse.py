@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import analytic_keyrate_dv01s, dv01_curve
+from insurance_hedging_simulator.historical import hedge_effectiveness_backtest
+from insurance_hedging_simulator.horizon import project_horizons
+from insurance_hedging_simulator.lapse import DeferredAnnuityBlock, DynamicLapse
+from insurance_hedging_simulator.liabilities import (
+    DeferredAnnuityCertain,
+    GompertzMakeham,
+)
+from insurance_hedging_simulator.reverse_stress import reverse_stress
+from insurance_hedging_simulator.scenario_store import (
+    stress_scenario_set,
+    write_scenario_set,
+)
+from insurance_hedging_simulator.stress import (
+    curve_from_shift,
+    run_stresses_on_liability_and_hedge,
+)
+
+PILLARS = [1, 2, 5, 10, 20, 30]
+CURVE = ZeroCurve(PILLARS, [0.030, 0.031, 0.033, 0.035, 0.036, 0.036])
+PRODUCT = DeferredAnnuityCertain(payment=10_000.0, n_payments=20, defer_years=10)
+
+
+def _block(lapse=None, **kw):
+    return DeferredAnnuityBlock(
+        product=kw.pop("product", PRODUCT),
+        issue_ages=[50.0, 55.0, 60.0],
+        credited_rates=[0.025, 0.030, 0.035],
+        cash_values=[90_000.0, 100_000.0, 110_000.0],
+        counts=[10.0, 20.0, 5.0],
+        lapse=lapse or DynamicLapse(),
+        **kw,
+    )
+
+
+def test_no_lapse_reduces_to_mortality_weighted_deferred_annuity():
+    block = _block(DynamicLapse(base_rate=0.0))
+    gm = GompertzMakeham()
+    expected = 0.0
+    for age, n in zip([50.0, 55.0, 60.0], [10.0, 20.0, 5.0]):
+        expected += n * sum(cf * gm.survival(age, t) * CURVE.df(t) for t, cf in PRODUCT.cashflows())
+    assert abs(block.pv(curve=CURVE) - expected) < 1e-6 * expected
+
+
+def test_lapses_rise_with_market_rates_above_credited():
+    lapse = DynamicLapse(base_rate=0.05, sensitivity=20.0)
+    assert np.allclose(lapse.annual_rate(np.array([0.02, 0.03, 0.04]), 0.03), [0.04, 0.05, 0.06])
+    assert lapse.annual_rate(np.array(1.0), 0.0) == 0.05 * lapse.cap_multiplier
+
+    block = _block()
+    shifts = np.array([[-200.0] * 6, [0.0] * 6, [200.0] * 6])
+    _, in_force, cashflows = block.projection(CURVE, shifts)
+    assert in_force.shape == cashflows.shape == (3, 30)
+    assert np.all(in_force[:, 0] < 35.0)
+    deferral_end = in_force[:, 9]  # in force after 10 years
+    assert np.all(np.diff(deferral_end) < 0)  # higher rates, more surrenders
+    assert np.all(np.diff(in_force[:, 10:], axis=-1) <= 0)
+    # no surrenders once the annuity is in payment: cashflows are just the installments
+    assert np.allclose(cashflows[:, 10:], in_force[:, 10:] * PRODUCT.payment)
+    assert np.all(cashflows[2, :10] > cashflows[0, :10])  # surrender outflows
+
+
+def test_chunked_scenarios_match_single_curve_valuation():
+    block = _block()
+    rng = np.random.default_rng(3)
+    shifts = rng.normal(0.0, 60.0, size=(37, len(PILLARS)))
+    batched = block.pv_under_shifts(CURVE, shifts, chunk_size=8 * 3 * 30)
+    singles = [block.pv(curve=curve_from_shift(CURVE, s)) for s in shifts]
+    assert np.allclose(batched, singles, rtol=1e-12)
+    assert np.allclose(block.pv_under_shifts(CURVE, shifts, chunk_size=1), batched)
+
+
+def test_many_policy_groups_are_valued_within_the_cell_budget(monkeypatch):
+    rng = np.random.default_rng(5)
+    n = 200
+    monthly = DeferredAnnuityCertain(
+        payment=10_000.0, n_payments=20, defer_years=10, payments_per_year=12
+    )
+    block = DeferredAnnuityBlock(
+        product=monthly,
+        issue_ages=rng.uniform(45.0, 65.0, n).tolist(),
+        credited_rates=rng.uniform(0.02, 0.04, n).tolist(),
+        cash_values=rng.uniform(50_000.0, 150_000.0, n).tolist(),
+        counts=rng.integers(1, 50, n).astype(float).tolist(),
+    )
+    seen = []
+    projection = DeferredAnnuityBlock.projection
+
+    def spy(self, curve, shifts_bp):
+        seen.append(len(shifts_bp))
+        return projection(self, curve, shifts_bp)
+
+    monkeypatch.setattr(DeferredAnnuityBlock, "projection", spy)
+    shifts = rng.normal(0.0, 50.0, size=(64, len(PILLARS)))
+    budget = 10 * n * 360
+    values = block.pv_under_shifts(CURVE, shifts, chunk_size=budget)
+    assert max(seen) == 10 and sum(seen) == 64
+
+    # reducing over policies inside the projection matches per-group valuation
+    def group(i):
+        return DeferredAnnuityBlock(
+            product=monthly,
+            issue_ages=block.issue_ages[i : i + 1],
+            credited_rates=block.credited_rates[i : i + 1],
+            cash_values=block.cash_values[i : i + 1],
+            counts=block.counts[i : i + 1],
+        )
+
+    expected = sum(group(i).pv_under_shifts(CURVE, shifts) for i in range(n))
+    assert np.allclose(values, expected, rtol=1e-10)
+
+
+def test_dynamic_lapse_changes_rate_risk_and_plugs_into_engines(tmp_path):
+    dynamic, static = _block(), _block(DynamicLapse(sensitivity=0.0))
+    assert dv01_curve(dynamic, CURVE) != dv01_curve(static, CURVE)
+
+    shocks = [
+        ("up", curve_from_shift(CURVE, [100.0] * 6)),
+        ("down", curve_from_shift(CURVE, [-100.0] * 6)),
+    ]
+    rows = run_stresses_on_liability_and_hedge(dynamic, CURVE, None, shocks)
+    assert rows[0]["liability_pnl"] < 0 < rows[1]["liability_pnl"]
+
+    shifts = np.array([[100.0] * 6, [-100.0] * 6, [0.0, 0.0, 50.0, 50.0, 100.0, 100.0]])
+    sset = write_scenario_set(str(tmp_path / "s.bin"), PILLARS, shifts)
+    res = stress_scenario_set(dynamic, CURVE, None, sset, chunk_size=2)
+    assert np.allclose(res["liability_pnl"][:2], [r["liability_pnl"] for r in rows])
+
+
+def test_block_runs_through_reverse_stress_and_backtest():
+    block = _block()
+    cov = 10.0**2 * (0.7 + 0.3 * np.eye(6))
+    res = reverse_stress(block, CURVE, None, cov_bp=cov, radius=2.0)
+    rows = run_stresses_on_liability_and_hedge(block, CURVE, None, res.as_shocks())
+    assert abs(rows[0]["liability_pnl"] - res.liability_pnl[0]) < 1e-6
+    worst = -res.net_pnl[0]
+    # no plausible move sampled on the same ellipsoid loses more
+    z = np.random.default_rng(0).standard_normal((200, 6))
+    z *= 2.0 / np.linalg.norm(z, axis=1, keepdims=True)
+    losses = -(block.pv_under_shifts(CURVE, z @ np.linalg.cholesky(cov).T) - block.pv(curve=CURVE))
+    assert worst >= losses.max() - 1e-6
+
+    hist = np.asarray(CURVE.zero_rates) + np.cumsum(
+        np.random.default_rng(1).normal(0.0, 5e-4, size=(30, 6)), axis=0
+    )
+    out = hedge_effectiveness_backtest(block, None, PILLARS, list(range(30)), hist)
+    day1 = [ZeroCurve(PILLARS, hist[i].tolist()) for i in (0, 1)]
+    expected = block.pv(curve=day1[1]) - block.pv(curve=day1[0])
+    assert len(out["rows"]) == 29 and abs(out["rows"][0]["liability_pnl"] - expected) < 1e-6
+
+
+def test_static_profile_paths_reject_the_block_clearly():
+    block = _block()
+    with pytest.raises(TypeError, match="scenario-dependent"):
+        analytic_keyrate_dv01s(block, CURVE)
+    with pytest.raises(TypeError, match="scenario-dependent"):
+        project_horizons(block, CURVE, None, [1.0])
@@ -0,0 +1,67 @@
+import numpy as np
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.stress import (
+    run_fast_stresses,
+    run_stresses_on_liability_and_hedge,
+    shock_keyrate_bp,
+    shock_matrix_from_curves,
+    shock_parallel_bp,
+)
+
+
+def _book(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    s10 = size_dv01_hedge_payer_fixed(0.5, curve, maturity_years=10)
+    s20 = size_dv01_hedge_payer_fixed(0.8, curve, maturity_years=20)
+    return liab, [s10, s20]
+
+
+def test_fast_stresses_match_full_reval_on_named_shocks(curve):
+    liab, hedge = _book(curve)
+    shocks = [
+        ("Parallel +100bp", shock_parallel_bp(curve, +100)),
+        ("+25bp @ 10y", shock_keyrate_bp(curve, 4, +25)),
+    ]
+    names, S = shock_matrix_from_curves(curve, shocks)
+    assert names == ["Parallel +100bp", "+25bp @ 10y"]
+
+    res = run_fast_stresses(liab, curve, hedge, S, tail_fraction=0.0)
+    rows = run_stresses_on_liability_and_hedge(liab, curve, hedge, shocks)
+    assert not res.full_reval.any()
+    for i, r in enumerate(rows):
+        # delta-gamma leaves only third-order error: well under 1% of the liability move
+        assert abs(res.liability_pnl[i] - r["liability_pnl"]) < 0.01 * abs(r["liability_pnl"])
+        assert abs(res.net_pnl[i] - r["net_pnl"]) < 0.01 * abs(r["liability_pnl"])
+
+
+def test_tail_and_error_bound_scenarios_are_fully_repriced(curve):
+    liab, hedge = _book(curve)
+    rng = np.random.default_rng(7)
+    S = rng.normal(0.0, 20.0, size=(2000, 6))
+    S[:3] = 300.0  # large moves the Taylor expansion handles badly
+
+    res = run_fast_stresses(liab, curve, hedge, S, tail_fraction=0.01, error_tol=0.05)
+    assert res.full_reval[:3].all()
+    assert 20 <= res.full_reval.sum() < 2000
+    assert res.accuracy["n_full_reval"] == res.full_reval.sum()
+    assert res.accuracy["max_abs_error"] >= res.accuracy["rmse"] > 0
+
+    rows = run_stresses_on_liability_and_hedge(
+        liab,
+        curve,
+        hedge,
+        [
+            (str(i), ZeroCurve(curve.pillars, list(np.add(curve.zero_rates, S[i] / 1e4))))
+            for i in np.flatnonzero(res.full_reval)[:5]
+        ],
+    )
+    for i, r in zip(np.flatnonzero(res.full_reval)[:5], rows):
+        assert abs(res.net_pnl[i] - r["net_pnl"]) < 1e-9
+
+    # delta-only is a worse approximation than delta-gamma
+    lin = run_fast_stresses(liab, curve, hedge, S, use_gamma=False, tail_fraction=0.01)
+    quad = run_fast_stresses(liab, curve, hedge, S, use_gamma=True, tail_fraction=0.01)
+    assert lin.accuracy["rmse"] > quad.accuracy["rmse"]
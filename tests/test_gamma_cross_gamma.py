@@ -0,0 +1,55 @@
+import numpy as np
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.cashflows import aggregate_cashflows
+from insurance_hedging_simulator.curve_risk import (
+    analytic_cross_gamma,
+    analytic_gamma,
+    analytic_keyrate_dv01s,
+    convexity_curve,
+    dv01_curve,
+    gamma_curve,
+    keyrate_dv01s,
+    keyrate_dv01s_and_cross_gamma,
+)
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.stress import (
+    run_stresses_on_liability_and_hedge,
+    shock_parallel_bp,
+)
+
+
+def test_bumped_cross_gamma_matches_analytic_for_hedged_book(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(dv01_curve(liab, curve), curve, maturity_years=10)
+    book = aggregate_cashflows([liab, swap])
+    keys = list(range(len(curve.pillars)))
+
+    kr01, gamma = keyrate_dv01s_and_cross_gamma(book, curve, keys, bp=1.0)
+    assert kr01 == keyrate_dv01s(book, curve, keys, bp=1.0)
+    assert np.allclose(gamma, gamma.T)
+
+    kr01_exact = analytic_keyrate_dv01s([liab, swap], curve)
+    gamma_exact = analytic_cross_gamma([liab, swap], curve)
+    for t in kr01:
+        assert abs(kr01[t] - kr01_exact[t]) < 1e-6
+    assert np.allclose(gamma, gamma_exact, rtol=1e-4, atol=1e-9)
+    # parallel gamma is the sum of the full cross-gamma matrix
+    assert abs(analytic_gamma(book, curve) - gamma_exact.sum()) < 1e-12
+    assert abs(gamma_curve(book, curve) - gamma_exact.sum()) < 1e-6
+
+
+def test_gamma_explains_convexity_mismatch_under_big_parallel_moves(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(dv01_curve(liab, curve), curve, maturity_years=10)
+    book = aggregate_cashflows([liab, swap])
+
+    assert convexity_curve(liab, curve) > 0
+    d01, g = dv01_curve(book, curve), gamma_curve(book, curve)
+    for bp in (+100, -100):
+        row = run_stresses_on_liability_and_hedge(
+            liab, curve, swap, [("p", shock_parallel_bp(curve, bp))]
+        )[0]
+        first = -d01 * bp
+        second = first + 0.5 * g * bp * bp
+        assert abs(row["net_pnl"] - second) < abs(row["net_pnl"] - first)
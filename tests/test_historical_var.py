@@ -0,0 +1,78 @@
+import numpy as np
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import dv01_curve
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.historical import (
+    HistoricalReplay,
+    hedge_effectiveness_backtest,
+)
+from insurance_hedging_simulator.stress import run_stresses_on_liability_and_hedge
+
+PILLARS = [0.5, 1, 2, 5, 10, 20]
+ZEROS = [0.030, 0.031, 0.033, 0.036, 0.038, 0.039]
+
+
+def _history(n_days=400, seed=3):
+    rng = np.random.default_rng(seed)
+    level = rng.normal(0.0, 5e-4, size=(n_days, 1))  # common daily move
+    local = rng.normal(0.0, 1e-4, size=(n_days, len(PILLARS)))
+    return np.asarray(ZEROS) + np.cumsum(level + local, axis=0)
+
+
+def test_incremental_window_matches_full_recompute_and_full_reval():
+    curve = ZeroCurve(PILLARS, ZEROS)
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(0.8 * dv01_curve(liab, curve), curve, maturity_years=10)
+    hist = _history()
+    dates = list(range(hist.shape[0]))
+    replay = HistoricalReplay(liab, curve, swap, dates[:-1], hist[:-1], window=100)
+
+    # scenario P&L equals a full repricing of the same shift applied to today's curve
+    shocked = ZeroCurve(PILLARS, (np.asarray(ZEROS) + replay.shifts_bp[7] / 1e4).tolist())
+    row = run_stresses_on_liability_and_hedge(liab, curve, swap, [("d7", shocked)])[0]
+    assert abs(replay.net_pnl[7] - row["net_pnl"]) < 1e-9
+
+    rows = replay.rolling_var()
+    assert len(rows) == len(replay.dates) - 100 + 1
+    for r, end in [(rows[0], 100), (rows[-1], len(replay.dates))]:
+        losses = np.sort(-replay.net_pnl[end - 100 : end])
+        assert r["var"] == losses[-1] and r["es"] == losses[-1]  # k = ceil(1% of 100) = 1
+
+    new = replay.advance(dates[-1], hist[-1])
+    losses = np.sort(-replay.net_pnl[-100:])
+    assert new["date"] == dates[-1]
+    assert abs(new["var"] - losses[-1]) < 1e-12
+
+
+def test_advance_on_a_fresh_replay_uses_the_full_window():
+    curve = ZeroCurve(PILLARS, ZEROS)
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    hist = _history()
+    n0 = 30
+    replay = HistoricalReplay(
+        liab, curve, None, list(range(n0)), hist[:n0], window=20, confidence=0.9
+    )
+    for day in range(n0, hist.shape[0]):  # grows past the preallocated buffers
+        row = replay.advance(day, hist[day])
+        losses = np.sort(-replay.net_pnl[-20:])
+        assert abs(row["var"] - losses[-2]) < 1e-12  # k = ceil(10% of 20) = 2
+        assert abs(row["es"] - losses[-2:].mean()) < 1e-12
+    assert replay.shifts_bp.shape == (hist.shape[0] - 1, len(PILLARS))
+    assert np.allclose(replay.shifts_bp, np.diff(hist, axis=0) * 1e4)
+
+
+def test_backtest_reports_strong_effectiveness_for_dv01_hedge():
+    curve = ZeroCurve(PILLARS, ZEROS)
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(dv01_curve(liab, curve), curve, maturity_years=10)
+    hist = _history()
+    out = hedge_effectiveness_backtest(liab, swap, PILLARS, list(range(len(hist))), hist)
+    assert len(out["rows"]) == len(hist) - 1
+    s = out["summary"]
+    assert s["variance_reduction"] > 0.8
+    assert -1.25 < s["hedge_ratio"] < -0.8
+    assert s["r_squared"] > 0.8
+    unhedged = hedge_effectiveness_backtest(liab, None, PILLARS, list(range(len(hist))), hist)
+    assert unhedged["summary"]["variance_reduction"] == 0.0
@@ -0,0 +1,93 @@
+import numpy as np
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import keyrate_dv01s
+from insurance_hedging_simulator.hedge_swap import (
+    SizedSwap,
+    size_dv01_hedge_payer_fixed,
+)
+from insurance_hedging_simulator.horizon import horizon_curves, project_horizons
+
+
+def test_horizon_zero_matches_today_and_rolled_objects(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10)
+    horizons = np.arange(0, 121) / 12.0  # monthly grid, ten years
+    out = project_horizons(liab, curve, swap, horizons, mode="roll_down")
+
+    # h = 0 is today's valuation and risk
+    assert abs(out["liability"].pv[0] - liab.pv(curve=curve)) < 1e-9
+    assert abs(out["hedge"].pv[0] - swap.pv(curve)) < 1e-9
+    kr_today = keyrate_dv01s(liab, curve, list(range(6)))
+    assert np.allclose(out["liability"].kr01[0], list(kr_today.values()), atol=1e-6)
+    kr_swap = keyrate_dv01s(swap, curve, list(range(6)))
+    assert np.allclose(out["hedge"].kr01[0], list(kr_swap.values()), atol=1e-6)
+
+    # after 3 years on the unchanged curve: 17 remaining payments, a 7y swap at the old rate
+    i3 = 36
+    assert abs(out["liability"].pv[i3] - AnnuityCertain(100.0, 17).pv(curve=curve)) < 1e-9
+    rolled = SizedSwap(7, 1, True, swap.notional, swap.fixed_rate)
+    assert abs(out["hedge"].pv[i3] - rolled.pv(curve)) < 1e-9
+    assert abs(out["liability"].cash_paid[i3] - 300.0) < 1e-12
+    kr_rolled = keyrate_dv01s(rolled, curve, list(range(6)))
+    assert np.allclose(out["hedge"].kr01[i3], list(kr_rolled.values()), atol=1e-6)
+
+    net = out["net"]
+    assert np.allclose(net.pv, out["liability"].pv + out["hedge"].pv)
+    assert np.allclose(net.dv01, net.kr01.sum(axis=1))
+
+
+def test_flat_curve_has_no_roll_down_and_forward_pv_compounds():
+    r = 0.03
+    curve = ZeroCurve([0.5, 1, 2, 5, 10, 30], [r] * 6)
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10, payments_per_year=2)
+    horizons = [0.0, 0.25, 1.0, 2.5, 12.0]
+    out = project_horizons(liab, curve, swap, horizons, mode="forwards")
+
+    for part in ("liability", "hedge", "net"):
+        assert np.allclose(out[part].roll_down, 0.0, atol=1e-9)
+    # on a flat curve a par swap stays at par at every reset date
+    assert abs(out["hedge"].pv[3]) < 1e-9
+    # with no payments yet, carry is just PV accreting at r
+    pv0 = liab.pv(curve=curve)
+    assert abs(out["liability"].carry[1] - pv0 * (np.exp(r * 0.25) - 1.0)) < 1e-9
+    fwd = horizon_curves(curve, horizons, mode="forwards")
+    assert np.allclose(fwd[2].zero_rates, r)
+
+
+def test_forwards_pv_and_risk_share_the_horizon_curve(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10)
+    horizons = [1.0, 3.0, 7.5]
+    out = project_horizons(liab, curve, swap, horizons, mode="forwards")
+    for i, (h, hc) in enumerate(zip(horizons, horizon_curves(curve, horizons, "forwards"))):
+        # PV is the reprice of the remaining cashflows on the reported horizon curve
+        repriced = sum(cf * hc.df(t - h) for t, cf in liab.cashflows() if t > h)
+        assert abs(out["liability"].pv[i] - repriced) < 1e-9
+        # ... and KR01 is that curve's bump-and-reprice risk
+        bumped = [
+            sum(cf * hc.bumped_key_index(k, 1e-4).df(t - h) for t, cf in liab.cashflows() if t > h)
+            for k in range(len(hc.pillars))
+        ]
+        assert np.allclose(out["liability"].kr01[i], repriced - np.array(bumped), rtol=1e-3)
+        # the exact forward-realized value (carry basis) differs only by the interpolation gap
+        exact = out["liability"].carry[i] + liab.pv(curve=curve) - out["liability"].cash_paid[i]
+        assert abs(out["liability"].pv[i] - exact) < 1e-3 * exact
+
+
+def test_roll_down_attribution_uses_each_modes_own_fixings(curve):
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10, payments_per_year=2)
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    horizons = [0.25, 1.75, 4.0]
+    roll = project_horizons(liab, curve, swap, horizons, mode="roll_down")
+    fwd = project_horizons(liab, curve, swap, horizons, mode="forwards")
+    for part in ("hedge", "net"):
+        # carry and roll-down do not depend on which mode is reported
+        assert np.allclose(roll[part].carry, fwd[part].carry)
+        assert np.allclose(roll[part].roll_down, fwd[part].roll_down)
+        # constant-curve value = today + carry + roll-down
+        value_roll = roll[part].pv + roll[part].cash_paid
+        pv0 = swap.pv(curve) + (liab.pv(curve=curve) if part == "net" else 0.0)
+        assert np.allclose(value_roll, pv0 + roll[part].carry + roll[part].roll_down)
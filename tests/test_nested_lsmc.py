@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.hedge_swap import (
+    SizedSwap,
+    size_dv01_hedge_payer_fixed,
+)
+from insurance_hedging_simulator.lapse import DeferredAnnuityBlock
+from insurance_hedging_simulator.liabilities import DeferredAnnuityCertain
+from insurance_hedging_simulator.nested import NestedSimulation, simulate_outer_states
+
+
+def _book(curve):
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10)
+    corr = 0.8 + 0.2 * np.eye(6)
+    cov = 50.0**2 * corr  # 50bp outer moves, highly correlated
+    return liab, swap, cov
+
+
+def test_fixed_cashflows_are_valued_exactly_on_each_outer_curve(curve):
+    liab, swap, _ = _book(curve)
+    nested = NestedSimulation(liab, curve, swap, horizon=2.0, inner_cov_bp=400.0 * np.eye(6))
+    up = np.add(curve.zero_rates, 0.01)
+    vals = nested.inner_values(np.array([curve.zero_rates, up]), n_inner=3)
+    # 18 remaining payments and an 8y swap at the old fixed rate, with no inner-shock bias
+    rolled = SizedSwap(8, 1, True, swap.notional, swap.fixed_rate)
+    for i, zeros in enumerate([curve.zero_rates, up]):
+        state = ZeroCurve(curve.pillars, list(zeros))
+        assert abs(vals["liability"][i] - AnnuityCertain(100.0, 18).pv(curve=state)) < 1e-9
+        assert abs(vals["hedge"][i] - rolled.pv(state)) < 1e-9
+
+
+def test_proxy_tracks_brute_force_nesting_and_reports_validation(curve):
+    liab, swap, cov = _book(curve)
+    rng = np.random.default_rng(11)
+    outer = simulate_outer_states(curve, 1.0, 600, cov, rng)
+    nested = NestedSimulation(liab, curve, swap, horizon=1.0)
+    proxy = nested.fit_proxy(outer, n_fit=150, n_inner_fit=10, n_validation=30, degree=2)
+
+    assert set(proxy.values) == {"liability", "hedge", "net"}
+    assert proxy.values["liability"].shape == (600,)
+    assert not set(proxy.fit_nodes) & set(proxy.validation_nodes)
+    diag = proxy.diagnostics["liability"]
+    assert diag["r_squared"] > 0.99
+    assert proxy.diagnostics["net"]["r_squared"] > 0.9
+    assert diag["max_abs_error"] >= diag["rmse"]
+
+    exact = nested.brute_force(outer[:50])
+    err = proxy.values["net"][:50] - exact["net"]
+    assert np.sqrt(np.mean(err**2)) < 0.1 * np.std(exact["liability"])
+
+
+def test_scenario_dependent_liability_is_nested_in_chunks(curve):
+    _, swap, cov = _book(curve)
+    block = DeferredAnnuityBlock(
+        product=DeferredAnnuityCertain(payment=1_000.0, n_payments=5, defer_years=3),
+        issue_ages=[55.0, 60.0],
+        credited_rates=[0.03, 0.035],
+        cash_values=[8_000.0, 9_000.0],
+    )
+    with pytest.raises(ValueError, match="inner_cov_bp"):
+        NestedSimulation(block, curve, swap, 1.0)
+
+    outer = simulate_outer_states(curve, 1.0, 12, cov, np.random.default_rng(5))
+    inner_cov = (20.0**2) * np.eye(6)
+    whole = NestedSimulation(block, curve, swap, 1.0, inner_cov, n_inner=40, seed=9)
+    chunked = NestedSimulation(
+        block, curve, swap, 1.0, inner_cov, n_inner=40, seed=9, chunk_size=120
+    )  # 3 outer states per batch
+    a, b = whole.brute_force(outer), chunked.brute_force(outer)
+    for name in ("liability", "hedge", "net"):
+        assert np.allclose(a[name], b[name], rtol=1e-12)
+    # the block's inner mean sits near its value on the outer curve itself
+    shifts = (outer - np.asarray(curve.zero_rates)) * 10000.0
+    assert np.allclose(a["liability"], block.pv_under_shifts(curve, shifts), rtol=0.02)
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import analytic_keyrate_dv01s, keyrate_dv01s
+from insurance_hedging_simulator.hedge_swap import schedule_dfs
+from insurance_hedging_simulator.liabilities import (
+    AnnuityCertain,
+    DeferredAnnuityCertain,
+    GompertzMakeham,
+    LifeAnnuityImmediate,
+    life_annuity_pv_grid,
+    payment_schedule,
+)
+
+CURVE = ZeroCurve([1, 2, 5, 10, 20, 30], [0.030, 0.031, 0.033, 0.035, 0.036, 0.036])
+
+
+def test_annual_default_is_unchanged():
+    ann = AnnuityCertain(payment=100.0, n_payments=5)
+    assert ann.cashflows() == [(t, 100.0) for t in range(1, 6)]
+    assert abs(ann.pv(r=0.03) - sum(100 * math.exp(-0.03 * t) for t in range(1, 6))) < 1e-9
+    deferred = DeferredAnnuityCertain(payment=100.0, n_payments=3, defer_years=2)
+    assert [t for t, _ in deferred.cashflows()] == [3, 4, 5]
+
+    life = LifeAnnuityImmediate(payment=100.0, n_payments=20, issue_age=65)
+    gm = life.mortality
+    expected = sum(100 * gm.survival(65, t) * CURVE.df(t) for t in range(1, 21))
+    assert abs(life.pv(curve=CURVE) - expected) < 1e-9
+
+
+def test_monthly_annuity_certain_matches_closed_form():
+    i, n = 0.04, 10
+    for m in (2, 4, 12):
+        ann = AnnuityCertain(
+            payment=1200.0, n_payments=n, compounding="annual", payments_per_year=m
+        )
+        assert len(ann.cashflows()) == n * m
+        assert abs(sum(cf for _, cf in ann.cashflows()) - 1200.0 * n) < 1e-9
+        i_m = m * ((1 + i) ** (1 / m) - 1)  # nominal rate convertible m-thly
+        assert abs(ann.pv(r=i) - 1200.0 * (1 - (1 + i) ** -n) / i_m) < 1e-8
+
+    deferred = DeferredAnnuityCertain(1200.0, 5, defer_years=3, payments_per_year=12)
+    times = [t for t, _ in deferred.cashflows()]
+    assert abs(times[0] - (3 + 1 / 12)) < 1e-12 and abs(times[-1] - 8.0) < 1e-12
+    # priced off the swaps' cached schedule grid, started at the deferral
+    dfs = schedule_dfs(CURVE, 5, 12, start=3)
+    assert abs(dfs[0] - CURVE.df(3.0)) < 1e-15
+    assert abs(deferred.pv(curve=CURVE) - 100.0 * dfs[1:].sum()) < 1e-9
+
+
+def test_monthly_life_annuity_uses_fractional_age_survival():
+    gm = GompertzMakeham()
+    monthly = LifeAnnuityImmediate(12000.0, 25, 70, gm, payments_per_year=12)
+    annual = LifeAnnuityImmediate(12000.0, 25, 70, gm)
+    flows = monthly.expected_cashflows()
+    for t, cf in flows[::37]:
+        assert abs(cf - 1000.0 * gm.survival(70, t)) < 1e-9
+    # earlier installments: worth more than annual-in-arrear, less than annual-in-advance
+    assert annual.pv(curve=CURVE) < monthly.pv(curve=CURVE) < annual.pv(curve=CURVE) + 12000.0
+
+    # schedules, survival vectors and DF grids are cached and shared
+    assert payment_schedule(25, 12) is monthly.payment_times()
+    assert np.shares_memory(monthly.survival_vector(), monthly.survival_vector())
+
+    ages = [60.0, 65.0, 70.0, 75.0]
+    grid = life_annuity_pv_grid(monthly, ages, CURVE)
+    for a, pv in zip(ages, grid):
+        single = LifeAnnuityImmediate(12000.0, 25, a, gm, payments_per_year=12)
+        assert abs(pv - single.pv(curve=CURVE)) < 1e-8
+
+
+def test_monthly_keyrate_dv01s_agree_with_bumping():
+    life = LifeAnnuityImmediate(12000.0, 30, 65, payments_per_year=12)
+    idx = list(range(len(CURVE.pillars)))
+    bumped = keyrate_dv01s(life, CURVE, idx)
+    analytic = analytic_keyrate_dv01s(life, CURVE)
+    assert np.allclose(list(analytic.values()), [bumped[t] for t in analytic], rtol=1e-5)
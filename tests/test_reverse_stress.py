@@ -0,0 +1,79 @@
+import numpy as np
+
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import analytic_keyrate_dv01s
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.liabilities import LifeAnnuityImmediate
+from insurance_hedging_simulator.reverse_stress import reverse_stress
+from insurance_hedging_simulator.stress import (
+    curve_from_shift,
+    run_stresses_on_liability_and_hedge,
+)
+
+PILLARS = [1, 2, 5, 10, 20, 30]
+CURVE = ZeroCurve(PILLARS, [0.030, 0.031, 0.033, 0.035, 0.036, 0.036])
+LIAB = LifeAnnuityImmediate(payment=1e5, n_payments=35, issue_age=60)
+
+
+def _cov_bp():
+    t = np.array(PILLARS, dtype=float)
+    vols = np.array([12.0, 11.0, 10.0, 9.0, 8.5, 8.0])
+    corr = np.exp(-np.abs(np.log(t[:, None] / t[None, :])))
+    return corr * np.outer(vols, vols)
+
+
+def _hedge():
+    dv01 = sum(analytic_keyrate_dv01s(LIAB, CURVE).values())
+    return size_dv01_hedge_payer_fixed(dv01, CURVE, maturity_years=10)
+
+
+def test_mahalanobis_worst_case_beats_random_plausible_moves():
+    cov, swap = _cov_bp(), _hedge()
+    res = reverse_stress(LIAB, CURVE, swap, cov_bp=cov, radius=3.0, n_scenarios=2)
+    assert res.constraint == "mahalanobis"
+    assert np.all(res.size <= 3.0 + 1e-9)
+    worst_loss = -res.net_pnl[0]
+    assert worst_loss > 0
+    assert np.all(np.diff(-res.net_pnl) <= 1e-9)  # worst first
+
+    # no sampled move on the radius-3 ellipsoid does worse
+    rng = np.random.default_rng(1)
+    z = rng.standard_normal((300, len(PILLARS)))
+    z *= 3.0 / np.linalg.norm(z, axis=1, keepdims=True)
+    samples = z @ np.linalg.cholesky(cov).T
+    shocks = [(f"s{i}", curve_from_shift(CURVE, s)) for i, s in enumerate(samples)]
+    rows = run_stresses_on_liability_and_hedge(LIAB, CURVE, swap, shocks)
+    assert worst_loss >= max(-r["net_pnl"] for r in rows) - 1e-6
+
+    # the returned curves plug straight into the stress runner with matching P&L
+    rows = run_stresses_on_liability_and_hedge(LIAB, CURVE, swap, res.as_shocks())
+    assert [r["shock"] for r in rows] == ["reverse_stress_1", "reverse_stress_2"][: len(rows)]
+    assert np.allclose([r["net_pnl"] for r in rows], res.net_pnl, atol=1e-6)
+
+
+def test_unhedged_worst_case_matches_kr01_closed_form():
+    cov = _cov_bp()
+    res = reverse_stress(LIAB, CURVE, None, cov_bp=cov, radius=2.0)
+    kr = np.array(list(analytic_keyrate_dv01s(LIAB, CURVE).values()))
+    linear = 2.0 * cov @ kr / np.sqrt(kr @ cov @ kr)
+    # rates down everywhere; convexity bends the optimum only slightly
+    assert np.all(res.shifts_bp[0] < 0) or np.all(res.shifts_bp[0] > 0)
+    cos = res.shifts_bp[0] @ linear / np.linalg.norm(res.shifts_bp[0]) / np.linalg.norm(linear)
+    assert cos > 0.99
+    assert -res.net_pnl[0] >= res.diagnostics["linear_worst_loss"] * 0.95
+
+
+def test_box_limits_respected_and_hedge_targets_twists():
+    limits = [25.0, 25.0, 20.0, 20.0, 15.0, 15.0]
+    swap = _hedge()
+    res = reverse_stress(LIAB, CURVE, swap, limits_bp=limits)
+    assert res.constraint == "box"
+    assert np.all(np.abs(res.shifts_bp[0]) <= np.array(limits) + 1e-9)
+    # a well-hedged book is exposed to curve twists, not parallel moves
+    assert np.any(res.shifts_bp[0] > 0) and np.any(res.shifts_bp[0] < 0)
+
+    # under correlated moves the hedge does reduce the worst plausible loss
+    cov = _cov_bp()
+    hedged = reverse_stress(LIAB, CURVE, swap, cov_bp=cov)
+    unhedged = reverse_stress(LIAB, CURVE, None, cov_bp=cov)
+    assert -hedged.net_pnl[0] < -unhedged.net_pnl[0]
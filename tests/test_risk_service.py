@@ -0,0 +1,128 @@
+import asyncio
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.curve_risk import dv01_curve, keyrate_dv01s
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.service import RiskService, call, serve
+from insurance_hedging_simulator.stress import (
+    run_stresses_on_liability_and_hedge,
+    shock_parallel_bp,
+)
+
+PILLARS = [0.5, 1, 2, 5, 10, 20]
+ZEROS = [0.030, 0.031, 0.033, 0.036, 0.038, 0.039]
+
+
+def test_service_serves_warm_risk_and_coalesces_concurrent_requests():
+    curve = ZeroCurve(PILLARS, ZEROS)
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+
+    async def scenario():
+        service = RiskService(batch_window=0.01)
+        server = await serve(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            await call(
+                "/curves", {"name": "usd", "pillars": PILLARS, "zero_rates": ZEROS}, port=port
+            )
+            await call(
+                "/liabilities",
+                {"name": "ac", "type": "AnnuityCertain", "payment": 100.0, "n_payments": 20},
+                port=port,
+            )
+            sized = await call(
+                "/size_hedge",
+                {"curve": "usd", "liability": "ac", "maturity_years": 10, "book": "hedges"},
+                port=port,
+            )
+            batches_before = service.stats["batches"]
+            replies = await asyncio.gather(
+                call("/pv", {"curve": "usd", "position": "ac"}, port=port),
+                call("/dv01", {"curve": "usd", "position": "ac"}, port=port),
+                call("/kr01", {"curve": "usd", "position": "ac"}, port=port),
+                call("/pv", {"curve": "usd", "position": "hedges"}, port=port),
+            )
+            batches = service.stats["batches"] - batches_before
+            stress = await call(
+                "/stress",
+                {
+                    "curve": "usd",
+                    "liability": "ac",
+                    "book": "hedges",
+                    "shocks": [{"name": "up", "parallel_bp": 100}],
+                },
+                port=port,
+            )
+            missing = await call("/pv", {"curve": "eur", "position": "ac"}, port=port)
+        return sized, replies, batches, stress, missing
+
+    sized, replies, batches, stress, missing = asyncio.run(scenario())
+    (s1, pv), (s2, d01), (s3, kr), (s4, hedge_pv) = replies
+    assert {s1, s2, s3, s4} == {200}
+    assert batches == 1  # four concurrent requests, one batched evaluation
+
+    assert abs(pv["pv"] - liab.pv(curve=curve)) < 1e-9
+    assert abs(d01["dv01"] - dv01_curve(liab, curve)) < 1e-6
+    kr_local = keyrate_dv01s(liab, curve, list(range(6)))
+    for t in PILLARS:
+        assert abs(kr["kr01"][str(float(t))] - kr_local[t]) < 1e-6
+    assert abs(hedge_pv["pv"]) < 1e-9  # par swap
+
+    swap = size_dv01_hedge_payer_fixed(dv01_curve(liab, curve), curve, maturity_years=10)
+    assert abs(sized[1]["swap"]["notional"] - swap.notional) / swap.notional < 1e-6
+    row = run_stresses_on_liability_and_hedge(
+        liab, curve, swap, [("up", shock_parallel_bp(curve, 100))]
+    )[0]
+    assert abs(stress[1]["rows"][0]["net_pnl"] - row["net_pnl"]) < 1e-3
+    assert missing[0] == 400
+
+
+def test_bad_requests_always_get_an_http_reply():
+    async def scenario():
+        service = RiskService(batch_window=0.001)
+        server = await serve(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            await call(
+                "/curves", {"name": "c", "pillars": [1, 10], "zero_rates": [0.03, 0.04]}, port=port
+            )
+            await call(
+                "/liabilities",
+                {"name": "ac", "type": "AnnuityCertain", "payment": 100.0, "n_payments": 5},
+                port=port,
+            )
+            base = {"curve": "c", "liability": "ac"}
+            bad_key = await call(
+                "/stress", {**base, "shocks": [{"name": "k", "key_index": 9, "bp": 25}]}, port=port
+            )
+            bad_len = await call(
+                "/stress", {**base, "shocks": [{"name": "s", "shifts_bp": [1, 2, 3]}]}, port=port
+            )
+
+            async def boom(req):
+                raise RuntimeError("kaboom")
+
+            service._routes["/pv"] = boom
+            internal = await call("/pv", {"curve": "c", "position": "ac"}, port=port)
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GARBAGE\r\n\r\n")
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /curves HTTP/1.1\r\nX-Big: " + b"a" * 70_000 + b"\r\n\r\n")
+            await writer.drain()
+            oversized = await reader.read()
+            writer.close()
+        return bad_key, bad_len, internal, raw, oversized
+
+    bad_key, bad_len, internal, raw, oversized = asyncio.run(scenario())
+    assert bad_key[0] == 400 and "key_index" in bad_key[1]["error"]
+    assert bad_len[0] == 400 and "shifts_bp" in bad_len[1]["error"]
+    assert internal == (500, {"error": "RuntimeError: kaboom"})
+    assert raw.startswith(b"HTTP/1.1 400 Bad Request")
+    assert oversized.startswith(b"HTTP/1.1 400 Bad Request")
+    assert b"Connection: close" in oversized
@@ -0,0 +1,53 @@
+import numpy as np
+
+from insurance_hedging_simulator import AnnuityCertain
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.scenario_store import (
+    ScenarioSet,
+    create_scenario_set,
+    stress_scenario_set,
+    write_scenario_set,
+)
+from insurance_hedging_simulator.stress import run_stresses_on_liability_and_hedge
+
+
+def test_round_trip_is_memory_mapped_and_feeds_the_stress_runner(curve, tmp_path):
+    rng = np.random.default_rng(0)
+    shifts = rng.normal(0.0, 15.0, size=(1000, 6))
+    ids = [f"hist-{i:05d}" for i in range(1000)]
+    path = str(tmp_path / "hist.scn")
+    write_scenario_set(path, curve.pillars, shifts, ids, metadata={"source": "historical"})
+
+    sset = ScenarioSet.open(path)
+    assert isinstance(sset.values, np.memmap)
+    assert sset.metadata == {"source": "historical"}
+    assert sset.scenario_ids(998) == ["hist-00998", "hist-00999"]
+    start, block = next(sset.chunks(256))
+    assert start == 0 and block.shape == (256, 6) and np.shares_memory(block, sset.values)
+    assert np.array_equal(sset.values, shifts)
+
+    liab = AnnuityCertain(payment=100.0, n_payments=20)
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10)
+    res = stress_scenario_set(liab, curve, swap, sset, chunk_size=300)
+    rows = run_stresses_on_liability_and_hedge(liab, curve, swap, sset.shocks(curve, 0, 5))
+    assert [r["shock"] for r in rows] == ids[:5]
+    for i, r in enumerate(rows):
+        assert abs(res["liability_pnl"][i] - r["liability_pnl"]) < 1e-9
+        assert abs(res["net_pnl"][i] - r["net_pnl"]) < 1e-9
+
+
+def test_zero_rate_sets_can_be_filled_block_by_block(curve, tmp_path):
+    path = str(tmp_path / "sim.scn")
+    sset = create_scenario_set(path, curve.pillars, n_scenarios=10, kind="zero")
+    for start in range(0, 10, 4):
+        stop = min(start + 4, 10)
+        sset.values[start:stop] = (
+            np.asarray(curve.zero_rates) + 0.01 * np.arange(start, stop)[:, None]
+        )
+    sset.values.flush()
+
+    reopened = ScenarioSet.open(path)
+    assert reopened.kind == "zero" and reopened.ids is None
+    assert reopened.scenario_ids(0, 2) == ["0", "1"]
+    shifts = reopened.shifts_bp(curve, reopened.values[:])
+    assert np.allclose(shifts[3], 300.0)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from insurance_hedging_simulator import GompertzMakeham, LifeAnnuityImmediate
+from insurance_hedging_simulator.curve import ZeroCurve
+from insurance_hedging_simulator.hedge_swap import size_dv01_hedge_payer_fixed
+from insurance_hedging_simulator.mortality_scenarios import (
+    StochasticGompertzMakeham,
+    run_joint_rate_mortality_scenarios,
+)
+
+
+def test_deterministic_limit_and_longevity_improvement():
+    gm = GompertzMakeham()
+    times = np.arange(1, 31, dtype=float)
+    rng = np.random.default_rng(1)
+    flat = StochasticGompertzMakeham(gm, drift=0.0, volatility=0.0)
+    surv = flat.survival_scenarios(65, times, 3, rng)
+    assert np.allclose(surv, [gm.survival(65, t) for t in times], rtol=1e-12)
+
+    improving = StochasticGompertzMakeham(gm, drift=-0.02, volatility=0.05)
+    batches = list(improving.iter_survival_batches(65, times, 1000, 300, rng))
+    assert [b.shape[0] for b in batches] == [300, 300, 300, 100]
+    sims = np.vstack(batches)
+    assert np.all(np.diff(sims, axis=1) <= 0)  # survival never increases
+    assert sims[:, -1].mean() > gm.survival(65, 30.0)
+
+
+def test_joint_grid_summary_matches_brute_force_and_is_chunk_invariant(curve):
+    liab = LifeAnnuityImmediate(payment=100.0, n_payments=30, issue_age=65)
+    swap = size_dv01_hedge_payer_fixed(1.0, curve, maturity_years=10)
+    rng = np.random.default_rng(5)
+    shifts = rng.normal(0.0, 30.0, size=(40, 6))
+    model = StochasticGompertzMakeham(drift=-0.01, volatility=0.05)
+    survival = model.survival_scenarios(65, np.arange(1, 31, dtype=float), 25, rng)
+
+    small = run_joint_rate_mortality_scenarios(
+        liab,
+        curve,
+        swap,
+        shifts,
+        model,
+        25,
+        rng,
+        confidence=0.95,
+        rate_chunk=7,
+        mortality_chunk=4,
+        survival=survival,
+    )
+    big = run_joint_rate_mortality_scenarios(
+        liab, curve, swap, shifts, model, 25, rng, confidence=0.95, survival=survival
+    )
+
+    # brute force over the full 40 x 25 grid
+    base = liab.pv(curve=curve)
+    base_swap = swap.pv(curve)
+    net = np.empty((40, 25))
+    for i, s in enumerate(shifts):
+        shocked = ZeroCurve(curve.pillars, list(np.add(curve.zero_rates, s / 1e4)))
+        dfs = np.array([shocked.df(t) for t in range(1, 31)])
+        hedge_pnl = swap.pv(shocked) - base_swap
+        net[i] = (100.0 * dfs) @ survival.T - base + hedge_pnl
+    losses = np.sort(-net.ravel())
+    k = 50  # 5% of 1000
+
+    for res in (small, big):
+        assert res.n_scenarios == 1000
+        assert abs(res.mean - net.mean()) < 1e-9
+        assert abs(res.std - net.std()) < 1e-6
+        assert abs(res.var - losses[-k]) < 1e-9
+        assert abs(res.es - losses[-k:].mean()) < 1e-9
+        assert abs(res.worst - losses[-1]) < 1e-9
+        assert np.allclose(res.mean_by_rate, net.mean(axis=1))
+        assert np.allclose(res.mean_by_mortality, net.mean(axis=0))
+
+
+def test_scenarios_use_the_liability_mortality_table(curve):
+    gm = GompertzMakeham(B=6e-5)
+    liab = LifeAnnuityImmediate(payment=100.0, n_payments=30, issue_age=65, mortality=gm)
+    shifts = np.zeros((3, 6))
+    rng = np.random.default_rng(2)
+    with pytest.raises(ValueError, match="liability.mortality"):
+        run_joint_rate_mortality_scenarios(
+            liab, curve, None, shifts, StochasticGompertzMakeham(), 5, rng
+        )
+    flat = StochasticGompertzMakeham(gm, drift=0.0, volatility=0.0)
+    res = run_joint_rate_mortality_scenarios(liab, curve, None, shifts, flat, 5, rng)
+    assert abs(res.mean) < 1e-9 and abs(res.worst) < 1e-9
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from insurance_hedging_simulator import (
+    GompertzMakeham,
+    JointLifeAnnuity,
+    LastSurvivorAnnuity,
+    LifeAnnuityImmediate,
+    ReversionaryAnnuity,
+)
+from insurance_hedging_simulator.curve_risk import analytic_keyrate_dv01s, keyrate_dv01s
+from insurance_hedging_simulator.liabilities import (
+    _TwoLifeAnnuity,
+    two_life_pv_grid,
+    two_life_survival_grids,
+)
+from insurance_hedging_simulator.stress import (
+    run_stresses_on_liability_and_hedge,
+    shock_parallel_bp,
+)
+
+
+def test_two_life_products_decompose_into_single_life_annuities(curve):
+    m1, m2 = GompertzMakeham(), GompertzMakeham(B=0.00002)
+    C, N, x, y = 100.0, 30, 67, 64
+    a_x = LifeAnnuityImmediate(C, N, x, mortality=m1).pv(curve=curve)
+    a_y = LifeAnnuityImmediate(C, N, y, mortality=m2).pv(curve=curve)
+    a_xy = JointLifeAnnuity(C, N, x, y, m1, m2).pv(curve=curve)
+    a_last = LastSurvivorAnnuity(C, N, x, y, m1, m2).pv(curve=curve)
+    a_rev = ReversionaryAnnuity(C, N, x, y, m1, m2).pv(curve=curve)
+
+    assert a_xy < min(a_x, a_y) and a_last > max(a_x, a_y)
+    assert abs(a_last - (a_x + a_y - a_xy)) < 1e-9
+    assert abs(a_rev - (a_y - a_xy)) < 1e-9
+    js = LastSurvivorAnnuity(C, N, x, y, m1, m2, survivor_fraction=2 / 3).pv(curve=curve)
+    assert a_xy < js < a_last
+
+    grids = two_life_survival_grids(m1, m2, [x], [y], [10.0])
+    assert abs(grids["joint"][0, 0, 0] - m1.survival(x, 10.0) * m2.survival(y, 10.0)) < 1e-15
+    assert m1.survival_grid([x], [10.0]) is m1.survival_grid([x], [10.0])  # cached
+
+
+def test_pv_grid_and_risk_paths_match_single_policy_pricing(curve):
+    ages_1, ages_2 = [60, 65, 70], [58, 62]
+    prod = LastSurvivorAnnuity(100.0, 25, 65, 62, survivor_fraction=0.5)
+    grid = two_life_pv_grid(prod, ages_1, ages_2, curve)
+    assert grid.shape == (3, 2)
+    assert abs(grid[1, 1] - prod.pv(curve=curve)) < 1e-9
+    assert np.all(np.diff(grid, axis=0) < 0)  # older primary life -> lower PV
+
+    rev = ReversionaryAnnuity(100.0, 30, 70, 65)
+    kr = keyrate_dv01s(rev, curve, [3, 4, 5])
+    kr_exact = analytic_keyrate_dv01s(rev, curve, [3, 4, 5])
+    for t in kr:
+        assert abs(kr[t] - kr_exact[t]) < 1e-6
+    row = run_stresses_on_liability_and_hedge(
+        rev, curve, None, [("up", shock_parallel_bp(curve, 100))]
+    )[0]
+    assert row["liability_pnl"] < 0 and row["hedge_pnl"] == 0.0
+
+
+def test_two_life_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        _TwoLifeAnnuity(100.0, 10, 65.0, 62.0)  # type: ignore[abstract]